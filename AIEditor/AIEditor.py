@@ -1,17 +1,40 @@
 #Import packages
+import os
 import ttkbootstrap as ttk
 from tkinter import filedialog
 from ttkbootstrap.dialogs import Messagebox
 
 # Import from files
 from style import SPACING, TABLEVIEW_STYLE, TABLEVIEW_ROW_HEIGHT
-from AIEditor.ui import CreateTable, CreateSecondaryTableview, CreateCompanyDetails, CreateButtons, ActivateButton
+from AIEditor.settings.config import IMPORT_WARMUP_DELAY_MS
+from AIEditor.ui import CreateTable, CreateSecondaryTableview, CreateCompanyDetails, CreateButtons, CreateProgressBar, CreateStatusBar, ActivateButton
 from AIEditor.logic.CRUD import (build_new_company, get_company_details, write_company_changes, 
-                   delete_company_and_reindex, pick_new_selection, prepare_field_value, 
-                   apply_generic_ai, get_selected_company, reselect_company)
-from AIEditor.logic.xml_utils import (load_xml_file, save_xml_to_file, build_new_xml_with_company, 
-                       build_city_map_from_xml, load_city_xml, ExportExcel, AnalyzeXML, has_xml)
-from AIEditor.logic.ui_utils import refresh_editor_ui, save_tableview_edits, apply_tableview_row_colors
+                   delete_companies_and_reindex, pick_new_selection,
+                   apply_generic_ai, get_selected_company, get_selected_companies, reselect_company)
+from AIEditor.logic.xml_utils import build_new_xml_with_company, has_xml
+from AIEditor.logic.ui_utils import (refresh_editor_ui, save_tableview_edits, apply_tableview_row_colors,
+                                     load_company_into_panel, populate_company_table, populate_company_tableview,
+                                     clear_measure_cache)
+from AIEditor.logic.company_index import build_company_index
+from AIEditor.logic.company_store import CompanyStore, get_company_store
+from AIEditor.logic.company_map import reset_company_map
+from AIEditor.logic.change_bus import ChangeBus, CompanyFieldsChanged, CompanyAdded, CompaniesReindexed, CityMapReplaced
+from AIEditor.logic.change_handlers import subscribe_model_handlers, subscribe_view_handlers
+from AIEditor.logic.incremental_save import can_patch_save
+from AIEditor.logic.virtual_table import (
+    get_table_company_ids,
+    remember_table_selection,
+    reset_table_selection,
+    remap_table_selection,
+)
+from AIEditor.logic.label_search import set_label_search_index
+from AIEditor.logic.warmup import warm_heavy_imports
+from AIEditor.logic.timing import add_timing_listener, format_span
+from AIEditor.logic.task_runner import TaskRunner, task_timing, record_task_timing
+from AIEditor.logic.jobs import load_xml_job, save_xml_job, load_city_job, export_excel_job, analyze_job
+
+# Tasks that read the XML tree in a worker: no edits while one of them runs
+TREE_READER_TASKS = ("save", "export", "analyze")
 
 class AIEditor(ttk.Frame):
     # 🏗️ Initialization
@@ -24,7 +47,20 @@ class AIEditor(ttk.Frame):
         self.table_available = True
         self.company_map = {}
         self.city_map = {}
+        self.company_map_rev = {}   # label → ID (see build_reverse_map)
+        self.company_map_version = 0   # bumped on every company_map patch (see company_map.py)
+        self.city_map_rev = {}
         self.preset_vars = {}
+        self.company_index = {}
+        self.company_store = None          # columnar read model of xml_root (company_store.py)
+        self.dirty_company_ids = set()     # company IDs edited since the last save
+        self.xml_structure_dirty = False   # companies added/deleted/renumbered
+        self.saved_file = None             # file that matches the in-memory XML
+        self.span_info = None              # byte spans of each <Company> in saved_file
+        self.tasks = TaskRunner(self, on_change=self.on_tasks_changed)
+        self.progress_task = None
+        self.changes = ChangeBus()         # model edits → store, company map, views
+        subscribe_model_handlers(self, self.changes)
 
         # Main container for layout
         main_frame = ttk.Frame(self, padding=SPACING["md"])
@@ -52,8 +88,33 @@ class AIEditor(ttk.Frame):
         CreateTable(self, self.right_content_frame)
         CreateSecondaryTableview(self, self.right_content_frame)
         self.tableview_container.grid_remove()
+        CreateProgressBar(self, right_frame)
+        CreateStatusBar(self, right_frame)
+        add_timing_listener(self.show_timing_status)
+        subscribe_view_handlers(self, self.changes)
         self.sync_editor_action_buttons()
 
+        # 🔥 pandas/openpyxl load in the background once the window is up
+        if IMPORT_WARMUP_DELAY_MS is not None:
+            self.after(IMPORT_WARMUP_DELAY_MS, warm_heavy_imports)
+
+    def set_xml_root(self, xml_root, company_store=None):
+        """Swap in a new AI XML root and reset everything derived from the old one."""
+        self.xml_root = xml_root
+        self.company_index = build_company_index(xml_root)
+        self.company_store = company_store if company_store is not None else CompanyStore.from_xml(xml_root)
+        reset_company_map(self)
+        self.column_width_tracker = {}   # new file → re-measure columns from scratch
+        clear_measure_cache()
+        self.dirty_company_ids = set()
+        self.xml_structure_dirty = False
+        self.saved_file = None
+        self.span_info = None
+        reset_table_selection(self)
+
+    def is_xml_dirty(self):
+        return bool(self.dirty_company_ids) or self.xml_structure_dirty
+
     def has_loaded_xml(self):
         return hasattr(self, "xml_root") and self.xml_root is not None
 
@@ -79,20 +140,48 @@ class AIEditor(ttk.Frame):
         self.editor_mode = "tableview"
         self.table_available = False
 
+    def show_timing_status(self, span):
+        """Timing listener → status bar (operations are only published from the Tk thread)."""
+        self.timing_status_var.set(format_span(span))
+
     def refresh_ui_after_xml_change(self):
         refresh_editor_ui(self)
         ActivateButton(self)
 
     def save_xml_to_path(self, file_path):
-        try:
-            save_xml_to_file(self.xml_root, file_path)
-            self.last_file = file_path
-            self.show_info(f"XML saved successfully to:\n{file_path}", "Success")
-            return True
-        except Exception as e:
-            self.show_error(f"Failed to save XML:\n{e}", "Error")
+        """Write the XML on the task pool (atomic replace). Skips clean, already-saved files."""
+        if self.tasks.is_busy("save"):
+            self.show_warning("A save is already running.", "Busy")
             return False
 
+        if not self.is_xml_dirty() and self.saved_file == file_path and os.path.exists(file_path):
+            self.show_info(f"No changes since the last save:\n{file_path}", "Saved")
+            return True
+
+        # ✂️ Only a few companies changed → splice them into the original bytes
+        dirty_companies = [self.company_index.get(cid) for cid in self.dirty_company_ids]
+        patch = not self.xml_structure_dirty and can_patch_save(self.span_info, dirty_companies)
+
+        root = self.xml_root
+        self.tasks.submit(
+            "save", save_xml_job, root, file_path, self.span_info, dirty_companies, patch,
+            message=f"Saving {file_path}",
+            on_done=lambda task, span_info: self.finish_xml_save(task, root, file_path, span_info),
+            on_error=lambda task, e: self.show_error(f"Failed to save XML:\n{e}", "Error"),
+        )
+        return True
+
+    def finish_xml_save(self, task, root, file_path, span_info):
+        with task_timing(task):
+            # A different XML may have been opened while saving
+            if self.xml_root is root:
+                self.last_file = file_path
+                self.saved_file = file_path
+                self.span_info = span_info
+                self.dirty_company_ids.clear()
+                self.xml_structure_dirty = False
+        self.show_info(f"XML saved successfully to:\n{file_path}", "Success")
+
     def show_info(self, message, title="Info"):
         Messagebox.show_info(message, title)
 
@@ -104,9 +193,13 @@ class AIEditor(ttk.Frame):
 
     def show_table_view(self):
         self.set_editor_mode("table")
+        if getattr(self, "company_table_stale", False):
+            populate_company_table(self)   # edits made while the Tableview was showing
 
     def show_tableview_mode(self):
         self.set_editor_mode("tableview")
+        if getattr(self, "tableview_stale", False):
+            populate_company_tableview(self)
 
     def sync_editor_action_buttons(self):
         has_xml = self.has_loaded_xml()
@@ -117,6 +210,11 @@ class AIEditor(ttk.Frame):
         else:
             table_state = "disabled"
 
+        # 💾 Save/export/analyze read the tree in a worker → no edits until they finish
+        if self.tasks.is_busy(*TREE_READER_TASKS):
+            has_xml = False
+            table_state = "disabled"
+
         self.save_ai_btn.config(state="normal" if has_xml else "disabled")
         self.add_button.config(state=table_state)
         self.delete_ai_btn.config(state=table_state)
@@ -149,26 +247,31 @@ class AIEditor(ttk.Frame):
         if not self.is_table_usable():
             return
 
+        # event is None when called directly (reselect after save) → always reload
+        selected_ids = remember_table_selection(self) if event is not None else set()
         selected_item = self.table.selection()
         if not selected_item:
             return
 
-        item = self.table.item(selected_item)
-        company_id = item['values'][0]
+        # Multi-select → show the row the user clicked last, else keep the one shown
+        focused = self.table.focus()
+        current_id = getattr(self, "selected_company_id", None)
+        if focused in selected_item:
+            company_id = self.table.item(focused)['values'][0]
+        elif current_id in selected_ids:
+            return
+        else:
+            company_id = self.table.item(selected_item[0])['values'][0]
+
+        # Same row again (e.g. selection restored after a virtual scroll) → details are already shown
+        if event is not None and str(company_id) == current_id:
+            return
+        self.selected_company_id = str(company_id)
 
-        details = get_company_details(self.xml_root, company_id)
+        details = get_company_details(self.xml_root, company_id, self.company_index)
 
-        for key, val in details.items():
-            if key in self.detail_vars:
-                main_val, dropdown_val = prepare_field_value(
-                    key, val, self.field_types,
-                    {"company_map": self.company_map, "city_map": self.city_map}  # pass sources
-                )
-                self.detail_vars[key].set(main_val)
-                if dropdown_val is not None:
-                    dropdown_var = self.detail_vars.get(f"{key}_dropdown")
-                    if dropdown_var is not None:
-                        dropdown_var.set(dropdown_val)
+        # 📥 One bulk assignment; HQ/Owner dropdowns are synced once at the end
+        load_company_into_panel(self, details)
 
     def new_ai_xml(self):
         # ⚠️ Confirm with the user before wiping
@@ -176,7 +279,7 @@ class AIEditor(ttk.Frame):
             return
 
         # Build a brand-new XML
-        self.xml_root = build_new_xml_with_company()
+        self.set_xml_root(build_new_xml_with_company())
 
         # Reset last_file, so Save As is required
         self.last_file = None
@@ -199,46 +302,116 @@ class AIEditor(ttk.Frame):
         if not file_path:
             return  # user cancelled
 
+        self.start_xml_load(file_path)
+
+    def start_xml_load(self, file_path):
+        """Parse the XML on the task pool; the progress bar can cancel it."""
+        if self.tasks.is_busy("load"):
+            self.show_warning("An XML file is already loading.", "Busy")
+            return
+
+        self.tasks.submit(
+            "load", load_xml_job, file_path,
+            message=f"Loading {file_path}",
+            cancellable=True,
+            on_progress=self.on_task_progress,
+            on_done=lambda task, result: self.finish_xml_load(task, file_path, result),
+            on_error=lambda task, e: self.show_error(f"Something went wrong 😢\n\n{e}", "Unexpected Error"),
+        )
+
+    def finish_xml_load(self, task, file_path, result):
         try:
-            self.xml_root = load_xml_file(file_path)
-            self.last_file = file_path   # ⭐ remember last file
+            with task_timing(task):
+                root, span_info, store = result
+                self.set_xml_root(root, store)
+                self.last_file = file_path   # ⭐ remember last file
+                self.saved_file = file_path
+                self.span_info = span_info
 
-            # 🔄 Update everything
-            self.refresh_ui_after_xml_change()
+                # 🔄 Update everything
+                self.refresh_ui_after_xml_change()
 
             self.show_info(f"XML loaded successfully! 🎉\n{file_path}", "Success")
 
         except Exception as e:
             self.show_error(f"Something went wrong 😢\n\n{e}", "Unexpected Error")
 
+    # ⏳ Background tasks
+    def on_tasks_changed(self):
+        """A task started or finished → update buttons and the progress row."""
+        self.sync_editor_action_buttons()
+        running = self.tasks.running()
+        if not running:
+            self.hide_progress()
+            return
+        task = running[-1]
+        if task is not self.progress_task:
+            self.show_progress(task)
+
+    def on_task_progress(self, task, fraction, message=None):
+        if task is self.progress_task:
+            self.progress_var.set(fraction * 100)
+
+    def show_progress(self, task):
+        self.progress_task = task
+        self.progress_label.config(text=task.message)
+        self.progress_var.set(0)
+        if task.on_progress is None:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+        self.progress_cancel_btn.config(
+            command=task.cancel,
+            state="normal" if task.cancellable else "disabled",
+        )
+        self.progress_frame.grid()
+
+    def hide_progress(self):
+        self.progress_task = None
+        self.progress_bar.stop()
+        self.progress_frame.grid_remove()
+
     def upload_city_xml(self):
         # Open file dialog to select XML
         file_path = filedialog.askopenfilename(
             title="Select City XML",
             filetypes=[("XML Files", "*.xml")]
         )
-        if file_path:
-            try:
-                self.city_xml_root = load_city_xml(file_path)
-                build_city_map_from_xml(self)
-                refresh_editor_ui(self)
-                self.show_info(f"City XML uploaded!\n", "Success")
-            except Exception as e:
-                self.show_error(f"Failed to load City XML:\n{e}", "Error")
+        if not file_path:
+            return
+        if self.tasks.is_busy("city"):
+            self.show_warning("A City XML is already loading.", "Busy")
+            return
+
+        self.tasks.submit(
+            "city", load_city_job, file_path,
+            message=f"Loading cities from {file_path}",
+            on_done=self.finish_city_load,
+            on_error=lambda task, e: self.show_error(f"Failed to load City XML:\n{e}", "Error"),
+        )
+
+    def finish_city_load(self, task, city):
+        with task_timing(task):
+            self.city_xml_root = city.city_xml_root
+            self.city_map = city.city_map
+            self.city_map_rev = city.city_map_rev
+            set_label_search_index(self, "city_map", city.city_search)   # 🔎 built in the worker
+            self.changes.publish(CityMapReplaced())
+        self.show_info(f"City XML uploaded!\n", "Success")
 
     # 📝 Company CRUD
     def add_new_company(self):
-        new_company, _ = build_new_company(self.xml_root)
+        new_company, _ = build_new_company(self.xml_root, self.company_index)
         self.xml_root.append(new_company)
+        self.xml_structure_dirty = True
+        self.changes.publish(CompanyAdded(new_company))
 
-        refresh_editor_ui(self)
         # 🔑 reselect last row
-        children = self.table.get_children()
+        children = get_table_company_ids(self)
         if children:
-            last_iid = children[-1]
-            item = self.table.item(last_iid)
-            company_id = str(item["values"][0])
-            reselect_company(self, company_id)
+            reselect_company(self, children[-1])
             return new_company
 
     def save_ai_company(self):
@@ -246,10 +419,7 @@ class AIEditor(ttk.Frame):
             if not self.checkXML():
                 return
 
-            applied, errors = save_tableview_edits(self)
-
-            if applied > 0:
-                refresh_editor_ui(self)
+            applied, errors = save_tableview_edits(self)   # publishes one event per edited company
 
             if errors:
                 self.show_warning(
@@ -268,25 +438,36 @@ class AIEditor(ttk.Frame):
         company, company_id, _ = get_selected_company(self)
         if company is None:
             return
-        write_company_changes(company, self.detail_vars, self.field_types)
+        if write_company_changes(company, self.detail_vars, self.field_types, self.dirty_company_ids):
+            self.changes.publish(CompanyFieldsChanged(company))
 
-        refresh_editor_ui(self)
         reselect_company(self, company_id)
         self.show_info("AI company changes saved (in memory).", "Saved")
 
     def delete_ai_company(self):
-        company, company_id, index = get_selected_company(self)
-        if company is None:
+        selected = get_selected_companies(self)
+        if not selected:
             return
-        delete_company_and_reindex(self.xml_root, index+1)
-        refresh_editor_ui(self)
+        if len(selected) > 1 and Messagebox.yesno(
+            f"Delete {len(selected)} companies and reindex all IDs?",
+            "Confirm Delete",
+            localize=False,   # compare against the untranslated button text
+        ) != "Yes":
+            return
+        companies = [company for company, _, _ in selected]
+        company_ids = [company_id for _, company_id, _ in selected]
+        index = selected[0][2]
+
+        # 🗑️ All selected rows go in one removal + one renumbering pass
+        mapping = delete_companies_and_reindex(self.xml_root, company_ids, self.company_index)
+        self.xml_structure_dirty = True
+        remap_table_selection(self, mapping)   # before the views re-render the selection
+        self.changes.publish(CompaniesReindexed(companies, mapping))
 
         # choose a sensible selection: same index (or the last one)
-        children = self.table.get_children()
-        new_iid = pick_new_selection(children, index)
-        if new_iid:
-            item = self.table.item(new_iid)
-            new_company_id = str(item["values"][0])
+        children = get_table_company_ids(self)
+        new_company_id = pick_new_selection(children, index)
+        if new_company_id:
             reselect_company(self, new_company_id)
         else:
             for k, var in self.detail_vars.items():
@@ -294,16 +475,19 @@ class AIEditor(ttk.Frame):
                     var.set("")
                 except Exception:
                     pass
-        self.show_info(f"Company {company_id} deleted and IDs reindexed.", "Deleted")
+        if len(company_ids) == 1:
+            self.show_info(f"Company {company_ids[0]} deleted and IDs reindexed.", "Deleted")
+        else:
+            self.show_info(f"{len(company_ids)} companies deleted and IDs reindexed.", "Deleted")
 
     def generic_ai_company(self):
         company, company_id, _ = get_selected_company(self)
         if company is None:
             return
 
-        apply_generic_ai(company)
+        if apply_generic_ai(company, self.dirty_company_ids):
+            self.changes.publish(CompanyFieldsChanged(company))
 
-        refresh_editor_ui(self)
         reselect_company(self, company_id)
         self.show_info(f"Company {company_id} has it's value set to generic.", "Done")
 
@@ -341,13 +525,24 @@ class AIEditor(ttk.Frame):
     def export_excel(self):
         if not self.checkXML():
             return
+        if self.tasks.is_busy("export"):
+            self.show_warning("An export is already running.", "Busy")
+            return
         file_path = filedialog.asksaveasfilename(
                     defaultextension=".xlsx",
                     filetypes=[("Excel Files", "*.xlsx")]
                 )
         if not file_path:
             return
-        ExportExcel(self.xml_root, file_path)
+        self.tasks.submit(
+            "export", export_excel_job, self.xml_root, file_path, get_company_store(self),
+            message=f"Exporting {file_path}",
+            on_done=self.finish_export_excel,
+            on_error=lambda task, e: self.show_error(f"Failed to export Excel:\n{e}", "Error"),
+        )
+
+    def finish_export_excel(self, task, file_path):
+        record_task_timing(task)
         self.show_info(f"XML has been exported as {file_path}", "Exported")
 
     def switch_mode(self):
@@ -360,4 +555,12 @@ class AIEditor(ttk.Frame):
     def analyze_xml(self):
         if not self.checkXML():
             return
-        AnalyzeXML(self.xml_root)
\ No newline at end of file
+        if self.tasks.is_busy("analyze"):
+            self.show_warning("An analysis is already running.", "Busy")
+            return
+        self.tasks.submit(
+            "analyze", analyze_job, self.xml_root, get_company_store(self),
+            message="Analyzing XML",
+            on_done=lambda task, _: record_task_timing(task),
+            on_error=lambda task, e: self.show_error(f"Failed to analyze XML:\n{e}", "Error"),
+        )
@@ -1,9 +1,20 @@
 # import from packages
+import logging
 import xml.etree.ElementTree as ET
 from ttkbootstrap.dialogs import Messagebox
 
 #import from different files
 from AIEditor.settings.config import CREDIT_MAP, CREDIT_MAP_REV, GENERIC_MAP, GENERIC_MAP_REV, FIELD_TYPES, GENERIC_AI_TEMPLATE
+from AIEditor.logic.company_index import find_company, index_company
+from AIEditor.logic.dirty_tracking import set_attr, mark_company_dirty
+from AIEditor.logic.virtual_table import (
+    get_selected_table_company_id,
+    get_selected_table_company_ids,
+    get_table_row_index,
+    select_table_company,
+)
+
+logger = logging.getLogger(__name__)
 
 def get_selected_company(self, *, require_xml=True):
     """
@@ -21,28 +32,46 @@ def get_selected_company(self, *, require_xml=True):
         Messagebox.show_warning("Table is not available right now.", "Table Missing")
         return None, None, None
 
-    sel = self.table.selection()
-    if not sel:
+    company_id = get_selected_table_company_id(self)
+    if not company_id:
         Messagebox.show_warning("Please select a company row.", "No selection")
         return None, None, None
 
-    iid = sel[0]
-    index = self.table.index(iid)
-    item = self.table.item(iid)
-
-    try:
-        company_id = str(item["values"][0])
-    except (IndexError, KeyError):
+    index = get_table_row_index(self, company_id)
+    if index is None:
         Messagebox.show_error("Invalid table selection.", "Error")
         return None, None, None
 
-    company = self.xml_root.find(f"Company[@ID='{company_id}']")
+    company = find_company(self.xml_root, company_id, getattr(self, "company_index", None))
     if company is None:
         Messagebox.show_error("Selected company not found in XML.", "Error")
         return None, None, None
 
     return company, company_id, index
 
+def get_selected_companies(self):
+    """
+    [(company, company_id, table_index), ...] for every selected row, in table order,
+    including rows scrolled out of a virtual window.
+    One selected row behaves like get_selected_company.
+    Shows user-facing errors and returns [] on failure.
+    """
+    company, company_id, index = get_selected_company(self)
+    if company is None:
+        return []
+
+    selected_ids = get_selected_table_company_ids(self)
+    if len(selected_ids) <= 1:
+        return [(company, company_id, index)]
+
+    selected = []
+    company_index = getattr(self, "company_index", None)
+    for row_id in selected_ids:
+        row_company = find_company(self.xml_root, row_id, company_index)
+        if row_company is not None:
+            selected.append((row_company, row_id, get_table_row_index(self, row_id)))
+    return selected
+
 def reselect_company(self, company_id):
     if not getattr(self, "table_available", True):
         Messagebox.show_warning("Table is hidden. Switch back to table mode first.", "Table Hidden")
@@ -51,16 +80,13 @@ def reselect_company(self, company_id):
         Messagebox.show_warning("Table is not available right now.", "Table Missing")
         return False
 
-    for iid in self.table.get_children():
-        vals = self.table.item(iid)['values']
-        
-        if str(vals[0]) == company_id:
-            self.table.selection_set(iid)
-            self.table.see(iid)
-            self.show_details(None)
-            print("Reselected")
-            return True
-    return False
+    # 🔑 Treeview rows use the company ID as their iid (scrolls virtual tables too)
+    if not select_table_company(self, company_id):
+        return False
+
+    self.show_details(None)
+    logger.debug("Reselected company %s", company_id)
+    return True
 
 def pick_new_selection(children, old_index):
     if not children:
@@ -68,16 +94,24 @@ def pick_new_selection(children, old_index):
     new_index = min(old_index, len(children) - 1)
     return children[new_index]
 
-def prepare_field_value(key, val, field_types, dropdown_sources):
-    """Return (main_value, dropdown_value) for a given field."""
+def prepare_main_value(key, val, field_types):
+    """Value for the field's own widget (no dropdown label lookup)."""
     field_type = field_types.get(key, "entry")
 
     if field_type == "Creditdropdown":
-        return CREDIT_MAP_REV.get(int(val), "D"), None
+        return CREDIT_MAP_REV.get(int(val), "D")
     elif field_type == "checkbox":
-        return (val == "1"), None
+        return val == "1"
     elif field_type == "Genericdropdown":
-        return GENERIC_MAP_REV.get(int(val), "Random"), None
+        return GENERIC_MAP_REV.get(int(val), "Random")
+    return val
+
+def prepare_field_value(key, val, field_types, dropdown_sources):
+    """Return (main_value, dropdown_value) for a given field."""
+    field_type = field_types.get(key, "entry")
+
+    if field_type in ("Creditdropdown", "checkbox", "Genericdropdown"):
+        return prepare_main_value(key, val, field_types), None
     else:
         # normal value
         main_value = val
@@ -96,8 +130,8 @@ def prepare_field_value(key, val, field_types, dropdown_sources):
 # ================================
 # 📝 Company CRUD Helpers
 # ================================
-def get_company_details(xml_root, company_id):
-    company = xml_root.find(f"Company[@ID='{company_id}']")
+def get_company_details(xml_root, company_id, company_index=None):
+    company = find_company(xml_root, company_id, company_index)
     if company is None:
         return {}
     details = {}
@@ -110,17 +144,19 @@ def get_company_details(xml_root, company_id):
                 details[f"{section}_{attr}"] = val
     return details
 
-def build_new_company(xml_root):
+def build_new_company(xml_root, company_index=None):
     """
     Create a new <Company> element with default values and add it to the XML.
     - Generates a unique ID (max existing ID + 1).
     - Initializes all required child elements with zero/default values.
-    - Refreshes the UI to show the new company.
+    - Registers it in company_index (if given); the caller appends it to xml_root.
     """
 
     # 🆔 Find next available company ID
-    max_id = 0
-    max_id = max((int(c.get("ID", 0)) for c in xml_root.findall("Company")), default=0)
+    if company_index is not None:
+        max_id = max((int(cid) for cid in company_index), default=0)
+    else:
+        max_id = max((int(c.get("ID", 0)) for c in xml_root.findall("Company")), default=0)
     new_id = max_id + 1
 
     # 🏗️ Build new company skeleton
@@ -137,26 +173,38 @@ def build_new_company(xml_root):
 
     # Add child nodes
     apply_generic_ai(new_company)
+    index_company(company_index, new_company)
 
     return new_company, new_id
 
-def apply_generic_ai(company):
+def apply_generic_ai(company, dirty_ids=None):
     """
     Resets a company to generic AI values (GearCity-style randomness).
+    Returns True if anything changed (and flags the company in dirty_ids).
     """
+    changed = False
     for tag, attributes in GENERIC_AI_TEMPLATE.items():
         element = company.find(tag)
 
         if element is None:
             element = ET.SubElement(company, tag)
+            changed = True
 
         for key, value in attributes.items():
-            element.set(key, value)
+            changed |= set_attr(element, key, value)
 
-def write_company_changes(company, detail_vars, field_types):
-    """Take the UI values and write them back into the given <Company> element."""
+    if changed:
+        mark_company_dirty(dirty_ids, company)
+    return changed
+
+def write_company_changes(company, detail_vars, field_types, dirty_ids=None):
+    """
+    Take the UI values and write them back into the given <Company> element.
+    Returns True if anything changed (and flags the company in dirty_ids).
+    """
 
     company_id = company.get("ID")
+    changed = False
 
     for key, var in detail_vars.items():
         # 🚫 skip UI-only helpers
@@ -172,7 +220,7 @@ def write_company_changes(company, detail_vars, field_types):
             attr = key.split("_", 1)[1]
             if attr == "ID":
                 continue
-            company.set(attr, str(val))
+            changed |= set_attr(company, attr, val)
             continue
 
         if "_" in key:
@@ -180,42 +228,61 @@ def write_company_changes(company, detail_vars, field_types):
             elem = company.find(section)
             if elem is None:
                 elem = ET.SubElement(company, section)
+                changed = True
 
             field_type = field_types.get(key, "entry")
 
             if field_type == "Creditdropdown":
                 num = CREDIT_MAP.get(val, 0)
-                elem.set(attr, str(num))
+                changed |= set_attr(elem, attr, num)
             elif field_type == "Genericdropdown":
                 num = GENERIC_MAP.get(val, 0)
-                elem.set(attr, str(num))
+                changed |= set_attr(elem, attr, num)
             elif field_type == "checkbox":
-                elem.set(attr, "1" if bool(val) else "0")
+                changed |= set_attr(elem, attr, "1" if bool(val) else "0")
             else:
-                elem.set(attr, str(val))
+                changed |= set_attr(elem, attr, val)
 
     # 🆕 Ensure Active flag is consistent
     owner_id = company.get("OwnerID")
-    company.set("Active", "1" if owner_id == company_id else "0")
+    changed |= set_attr(company, "Active", "1" if owner_id == company_id else "0")
 
-def delete_company_and_reindex(xml_root, company_id_to_delete):
+    if changed:
+        mark_company_dirty(dirty_ids, company)
+    return changed
+
+def delete_company_and_reindex(xml_root, company_id_to_delete, company_index=None):
     """
     Delete the <Company> element with ID == company_id_to_delete (str or int),
     then renumber remaining companies' ID attributes sequentially (1..N),
     and update OwnerID attributes to the new numbering.
+    company_index (if given) is rebuilt in place for the new IDs.
 
     Returns the mapping {old_id (int): new_id (int)}.
 
     Raises KeyError if the company to delete was not found.
     """
-    cid_str = str(company_id_to_delete)
-    # find the company to remove
-    company_elem = xml_root.find(f"Company[@ID='{cid_str}']")
-    if company_elem is None:
-        raise KeyError(f"Company ID {cid_str} not found")
+    return delete_companies_and_reindex(xml_root, [company_id_to_delete], company_index)
+
+def delete_companies_and_reindex(xml_root, company_ids, company_index=None):
+    """
+    Bulk version of delete_company_and_reindex: remove every company in company_ids,
+    then renumber IDs and remap OwnerIDs in one pass over the remaining companies.
 
-    # remove the element
-    xml_root.remove(company_elem)
+    Returns one combined mapping {old_id (int): new_id (int)}.
+
+    Raises KeyError (and deletes nothing) if any ID was not found.
+    """
+    # find every company to remove first, so a bad ID leaves the XML untouched
+    to_remove = set()
+    for company_id in dict.fromkeys(str(cid) for cid in company_ids):
+        company_elem = find_company(xml_root, company_id, company_index)
+        if company_elem is None:
+            raise KeyError(f"Company ID {company_id} not found")
+        to_remove.add(company_elem)
+
+    # remove them all with a single rebuild of the children (remove() is O(N) per call)
+    xml_root[:] = [child for child in xml_root if child not in to_remove]
 
     # gather remaining companies in document order
     remaining = xml_root.findall("Company")
@@ -249,7 +316,12 @@ def delete_company_and_reindex(xml_root, company_id_to_delete):
         if owner_int in mapping:
             comp.set("OwnerID", str(mapping[owner_int]))
         else:
-            # owner pointed to deleted company (or unknown) → clear/zero it
+            # owner pointed to a deleted company (or unknown) → clear/zero it
             comp.set("OwnerID", "0")
 
-    return mapping
\ No newline at end of file
+    if company_index is not None:
+        company_index.clear()
+        for comp in remaining:
+            company_index[comp.get("ID")] = comp
+
+    return mapping
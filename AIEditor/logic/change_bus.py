@@ -0,0 +1,71 @@
+"""
+Typed change events for the AI XML model.
+Mutations publish what they touched; the derived models (company store,
+company map) and the views subscribe and update only that part.
+"""
+# import from packages
+import logging
+
+# import from different files
+from AIEditor.logic.timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeEvent:
+    """Base class; subscribing to it receives every event."""
+    __slots__ = ()
+
+
+class CompanyFieldsChanged(ChangeEvent):
+    """Values of one <Company> changed in place. fields: FIELD_TYPES keys, or None if unknown."""
+    __slots__ = ("company", "fields")
+
+    def __init__(self, company, fields=None):
+        self.company = company
+        self.fields = fields
+
+
+class CompanyAdded(ChangeEvent):
+    """A new <Company> was appended to xml_root."""
+    __slots__ = ("company",)
+
+    def __init__(self, company):
+        self.company = company
+
+
+class CompaniesReindexed(ChangeEvent):
+    """Companies were removed and the rest renumbered; mapping is {old ID: new ID}."""
+    __slots__ = ("removed", "mapping")
+
+    def __init__(self, removed, mapping):
+        self.removed = list(removed)
+        self.mapping = mapping
+
+
+class CityMapReplaced(ChangeEvent):
+    """editor.city_map (and city_map_rev) point to a freshly loaded City XML."""
+    __slots__ = ()
+
+
+class ChangeBus:
+    """Synchronous publish/subscribe on the Tk thread; handlers run in subscription order."""
+
+    def __init__(self):
+        self._handlers = {}   # event class → [handler]
+
+    def subscribe(self, event_type, handler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event):
+        name = type(event).__name__
+        logger.debug("publish %s", name)
+        with timed(name):
+            for event_type in type(event).__mro__:
+                for handler in list(self._handlers.get(event_type, ())):
+                    handler(event)
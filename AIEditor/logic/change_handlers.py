@@ -0,0 +1,66 @@
+"""
+Editor subscribers for the change bus (see change_bus.py).
+Model handlers are subscribed first so every view handler already sees the
+updated company store and company map.
+"""
+# import from packages
+from functools import partial
+
+# import from different files
+from AIEditor.logic.change_bus import CompanyFieldsChanged, CompanyAdded, CompaniesReindexed, CityMapReplaced
+from AIEditor.logic.company_store import get_company_store
+from AIEditor.logic.company_map import sync_company_map_entry, add_company_to_map, reindex_company_map
+from AIEditor.logic.ui_utils import (
+    refresh_company_views,
+    refresh_detail_dropdowns,
+    update_company_rows,
+    company_names_changed,
+    company_views_show_fields,
+)
+
+
+# 🧮 Derived models
+def subscribe_model_handlers(editor, bus):
+    bus.subscribe(CompanyFieldsChanged, partial(on_company_fields_changed_model, editor))
+    bus.subscribe(CompanyAdded, partial(on_company_added_model, editor))
+    bus.subscribe(CompaniesReindexed, partial(on_companies_reindexed_model, editor))
+
+def on_company_fields_changed_model(editor, event):
+    get_company_store(editor).refresh_company(event.company)
+    sync_company_map_entry(editor, event.company)
+
+def on_company_added_model(editor, event):
+    get_company_store(editor).append_company(event.company)
+    add_company_to_map(editor, event.company)
+
+def on_companies_reindexed_model(editor, event):
+    reindex_company_map(editor, event.mapping)
+    store = get_company_store(editor)
+    store.remove_companies(event.removed)
+    store.refresh_columns(("ID", "OwnerID"))   # renumbered by the reindex
+
+
+# 🖼️ Views
+def subscribe_view_handlers(editor, bus):
+    bus.subscribe(CompanyFieldsChanged, partial(on_company_fields_changed_view, editor))
+    bus.subscribe(CompanyAdded, partial(on_company_list_changed_view, editor))
+    bus.subscribe(CompaniesReindexed, partial(on_company_list_changed_view, editor))
+    bus.subscribe(CityMapReplaced, partial(on_city_map_replaced_view, editor))
+
+def on_company_fields_changed_view(editor, event):
+    if company_names_changed(editor):
+        # a rename shows up in other companies' Owner column and in the Owner dropdowns
+        refresh_company_views(editor)
+        refresh_detail_dropdowns(editor, ("company_map",))
+        return
+    if not company_views_show_fields(editor, event.fields):
+        return   # e.g. a Tableview edit of a column no view shows; cached rows rebuild on their new stamp
+    update_company_rows(editor, [event.company])
+
+def on_company_list_changed_view(editor, event):
+    refresh_company_views(editor)
+    refresh_detail_dropdowns(editor, ("company_map",))
+
+def on_city_map_replaced_view(editor, event):
+    refresh_company_views(editor)
+    refresh_detail_dropdowns(editor, ("city_map",))
@@ -0,0 +1,45 @@
+def build_company_index(xml_root):
+    """
+    Build {ID (str): <Company> element} for constant-time lookups.
+    Duplicate IDs keep the first element, same as Company[@ID='...'] did.
+    """
+    company_index = {}
+    if xml_root is None:
+        return company_index
+    for company in xml_root.findall("Company"):
+        company_index.setdefault(company.get("ID", ""), company)
+    return company_index
+
+def index_company(company_index, company):
+    """Register one <Company> element (e.g. a freshly built one) in the index."""
+    if company_index is not None:
+        company_index.setdefault(company.get("ID", ""), company)
+
+def find_company(xml_root, company_id, company_index=None):
+    """Return the <Company> with the given ID, using the index when one is given."""
+    if company_index is not None:
+        return company_index.get(str(company_id))
+    if xml_root is None:
+        return None
+    return xml_root.find(f"Company[@ID='{company_id}']")
+
+def check_company_index(xml_root, company_index):
+    """
+    Compare the index against the XML tree.
+    Returns a list of human readable problems (empty when in sync).
+    """
+    problems = []
+    expected = build_company_index(xml_root)
+
+    for cid, company in expected.items():
+        indexed = company_index.get(cid)
+        if indexed is None:
+            problems.append(f"Company ID {cid} is missing from the index.")
+        elif indexed is not company:
+            problems.append(f"Company ID {cid} points to a stale element.")
+
+    for cid in company_index:
+        if cid not in expected:
+            problems.append(f"Index has unknown company ID {cid}.")
+
+    return problems
@@ -0,0 +1,122 @@
+# import from packages
+from collections import Counter
+
+# import from different files
+from AIEditor.logic.company_table_utils import build_reverse_map
+
+# editor.company_map ({ID: Name}) is built once per XML root and then patched in place.
+# editor.company_map_version goes up on every change, so dropdowns, search indexes and
+# cached table rows can tell "same map object, different contents" apart.
+# editor.company_map_rev ({str(Name): ID}, see build_reverse_map) is patched alongside;
+# company_map_label_counts says when a label is shared, the only case that needs a scan.
+
+
+def load_company_map(self):
+    """
+    Parse the XML and return {ID: Name} dict.
+    Example:
+        {1: "Toyota", 2: "Honda", 3: "Renault"}
+    """
+    company_map = {}
+    for company in self.xml_root.findall("Company"):  # adjust tag as needed
+        cid = int(company.get("ID"))  # or however ID is stored
+        cname = company.get("Name")  # <-- FIXED, use attribute not element
+        company_map[cid] = cname
+    return company_map
+
+def map_version(editor, dropdown_source):
+    """(map object, version) — changes whenever the map is replaced or patched."""
+    return getattr(editor, dropdown_source, None), getattr(editor, f"{dropdown_source}_version", 0)
+
+def bump_company_map(editor, rebuild_reverse=True):
+    editor.company_map_version = getattr(editor, "company_map_version", 0) + 1
+    if rebuild_reverse:
+        rebuild_reverse_company_map(editor)
+
+def rebuild_reverse_company_map(editor):
+    editor.company_map_rev = build_reverse_map(editor.company_map)
+    editor.company_map_label_counts = Counter(str(name) for name in editor.company_map.values())
+
+def first_id_with_label(company_map, label):
+    """What build_reverse_map picks for a shared label: the first ID in map order."""
+    return next((cid for cid, name in company_map.items() if str(name) == label), None)
+
+def add_reverse_label(editor, cid, name):
+    label = str(name)
+    counts = editor.company_map_label_counts
+    counts[label] += 1
+    if counts[label] == 1:
+        editor.company_map_rev[label] = cid
+    else:
+        editor.company_map_rev[label] = first_id_with_label(editor.company_map, label)
+
+def drop_reverse_label(editor, cid, name):
+    """Forget that `cid` was called `name` (call after the map no longer says so)."""
+    label = str(name)
+    counts = editor.company_map_label_counts
+    counts[label] -= 1
+    if counts[label] <= 0:
+        del counts[label]
+        editor.company_map_rev.pop(label, None)
+    elif editor.company_map_rev.get(label) == cid:
+        editor.company_map_rev[label] = first_id_with_label(editor.company_map, label)
+
+def ensure_reverse_company_map(editor):
+    if not hasattr(editor, "company_map_label_counts"):
+        rebuild_reverse_company_map(editor)
+
+def reset_company_map(editor):
+    """Full rebuild from the XML (new file / new XML)."""
+    xml_root = getattr(editor, "xml_root", None)
+    editor.company_map = load_company_map(editor) if xml_root is not None else {}
+    editor.company_map_root = xml_root
+    bump_company_map(editor)
+
+def ensure_company_map(editor):
+    """Rebuild only if the map belongs to another XML root."""
+    if getattr(editor, "company_map_root", None) is not getattr(editor, "xml_root", None):
+        reset_company_map(editor)
+
+def sync_company_map_entry(editor, company):
+    """After editing one <Company>: patch its name in the map. Returns True if it changed."""
+    company_map = editor.company_map
+    try:
+        cid = int(company.get("ID"))
+    except (TypeError, ValueError):
+        return False
+    name = company.get("Name")
+    existed = cid in company_map
+    old_name = company_map.get(cid)
+    if existed and old_name == name:
+        return False
+    ensure_reverse_company_map(editor)
+    company_map[cid] = name
+    if existed:
+        drop_reverse_label(editor, cid, old_name)
+    add_reverse_label(editor, cid, name)
+    bump_company_map(editor, rebuild_reverse=False)
+    return True
+
+def add_company_to_map(editor, company):
+    """A freshly appended <Company> → new map entry (reverse map patched too)."""
+    cid = int(company.get("ID"))
+    name = company.get("Name")
+    ensure_reverse_company_map(editor)
+    existed = cid in editor.company_map
+    old_name = editor.company_map.get(cid)
+    editor.company_map[cid] = name
+    if existed:   # ID reused: shouldn't happen, but keep the reverse map exact
+        drop_reverse_label(editor, cid, old_name)
+    add_reverse_label(editor, cid, name)
+    bump_company_map(editor, rebuild_reverse=False)
+
+def reindex_company_map(editor, mapping):
+    """
+    Apply the {old_id: new_id} mapping from delete_company_and_reindex.
+    IDs missing from the mapping (the deleted company) drop out.
+    """
+    company_map = editor.company_map
+    renumbered = {mapping[cid]: name for cid, name in company_map.items() if cid in mapping}
+    company_map.clear()
+    company_map.update(sorted(renumbered.items()))
+    bump_company_map(editor)
@@ -0,0 +1,411 @@
+# import from packages
+import math
+from array import array
+
+# import from different files
+from AIEditor.settings.config import FIELD_TYPES
+
+MISSING_INT = -(1 << 63)   # "no value" marker inside int columns
+INT64_LIMIT = 1 << 63
+
+
+def collect_company_columns(xml_root):
+    """
+    Walk the companies once and return ({column: [raw str or None, ...]}, row_count).
+    Company attributes keep their name ("ID"), child attributes become "Funds_OnHand".
+    """
+    columns = {}
+    count = 0
+
+    def put_slow(name, value):
+        col = columns.get(name)
+        if col is None:
+            col = columns[name] = [None] * count
+        elif len(col) < count:
+            col.extend([None] * (count - len(col)))
+        else:
+            col[-1] = value   # repeated attribute/section → last one wins
+            return
+        col.append(value)
+
+    for company in xml_root.iterfind("Company"):
+        for key, value in company.attrib.items():
+            col = columns.get(key)
+            if col is not None and len(col) == count:
+                col.append(value)
+            else:
+                put_slow(key, value)
+        for child in company:
+            tag = child.tag
+            for key, value in child.attrib.items():
+                name = f"{tag}_{key}"
+                col = columns.get(name)
+                if col is not None and len(col) == count:
+                    col.append(value)
+                else:
+                    put_slow(name, value)
+        count += 1
+
+    for col in columns.values():
+        if len(col) < count:
+            col.extend([None] * (count - len(col)))
+
+    return columns, count
+
+
+def column_kind(column):
+    """Schema type of a column from FIELD_TYPES: int / float / category / text / None."""
+    if column == "ID":
+        return "int"   # shown as a read-only text field, but always numeric
+    field_cfg = FIELD_TYPES.get(column) or FIELD_TYPES.get(f"Company_{column}")
+    if field_cfg is None:
+        return None   # not in the schema → numeric if every value parses
+    field_type = field_cfg.get("type")
+    if field_type == "spinbox":
+        return "float" if isinstance(field_cfg.get("step", 1), float) else "int"
+    if field_type in ("number", "Genericdropdown", "checkbox"):
+        return "int"
+    if field_type == "Creditdropdown":
+        return "category"
+    return "text"
+
+
+def text_column_is_numeric(values):
+    """(numeric, whole) for a text column: numeric if every non-empty value parses (like parse_numbers)."""
+    whole = True
+    for text in values:
+        if text is None or text == "":
+            continue
+        try:
+            number = float(text)
+        except ValueError:
+            return False, False
+        if whole and not number.is_integer():
+            whole = False
+    return True, whole
+
+
+def store_column_name(field_key):
+    """FIELD_TYPES key → store column: "Company_Name" → "Name", "Funds_OnHand" stays."""
+    if field_key.startswith("Company_"):
+        return field_key[len("Company_"):]
+    return field_key
+
+
+class StoreColumn:
+    """
+    One field for every company.
+    - numeric kinds: array('q') (MISSING_INT = missing) or array('d') (NaN = missing)
+    - text / unknown kinds: list of str or None
+    raw keeps the original text where it isn't the canonical form of the number
+    ("0.50", "007", ""): None until the first such row, then a row-aligned list
+    (cheaper than a dict when, as with "0.50"-style ratings, most rows need it).
+    invalid holds rows whose text isn't a number at all.
+    """
+    __slots__ = ("name", "kind", "values", "raw", "invalid", "_text_numbers")
+
+    def __init__(self, name, kind, count=0):
+        self.name = name
+        self.kind = kind
+        self.raw = None
+        self.invalid = set()
+        self._text_numbers = None   # cached text_column_is_numeric(values) for unknown-kind columns
+        if kind in ("int", "category"):
+            self.values = array("q", [MISSING_INT]) * count
+        elif kind == "float":
+            self.values = array("d", [math.nan]) * count
+        else:
+            self.values = [None] * count
+
+    @property
+    def numeric(self):
+        return not isinstance(self.values, list)
+
+    @property
+    def is_float(self):
+        return self.numeric and self.values.typecode == "d"
+
+    def text_numbers(self):
+        """(numeric, whole) for a text column, parsed once and kept until the column changes."""
+        if self.numeric or self.kind == "text":
+            return False, False
+        if self._text_numbers is None:
+            self._text_numbers = text_column_is_numeric(self.values)
+        return self._text_numbers
+
+    @classmethod
+    def from_values(cls, name, values):
+        """Build a column from raw strings (None = attribute missing) in one pass."""
+        column = cls(name, column_kind(name))
+        if not column.numeric:
+            column.values = values
+            return column
+
+        # 🚀 Clean column: C-speed conversion, then spot non-canonical text ("0.50", "007")
+        try:
+            if column.is_float:
+                column.values = array("d", map(float, values))
+            else:
+                column.values = array("q", map(int, values))
+        except (TypeError, ValueError, OverflowError):
+            column.values = column.values[:0]
+        else:
+            texts = list(map(str, column.values))
+            if texts != values:
+                column.raw = [None if text == canon else text for text, canon in zip(values, texts)]
+            return column
+
+        for text in values:
+            column.append(text)
+        return column
+
+    def __len__(self):
+        return len(self.values)
+
+    def _promote_to_float(self):
+        self.values = array("d", (math.nan if v == MISSING_INT else float(v) for v in self.values))
+
+    def _encode(self, row, text):
+        """Numeric value to store for `text`, recording raw/invalid for that row."""
+        self._set_raw(row, None)
+        self.invalid.discard(row)
+        if text is None:
+            return None
+        if text == "":
+            self._set_raw(row, text)
+            return None
+        try:
+            number = int(text) if not self.is_float else float(text)
+            if not self.is_float and not -INT64_LIMIT < number < INT64_LIMIT:
+                raise OverflowError()
+        except (ValueError, OverflowError):
+            try:
+                number = float(text)
+            except ValueError:
+                self._set_raw(row, text)
+                self.invalid.add(row)
+                return None
+            if not self.is_float:
+                if number.is_integer() and abs(number) < INT64_LIMIT:
+                    number = int(number)
+                else:
+                    self._promote_to_float()   # fractional value in an int field
+        if self._text(number) != text:
+            self._set_raw(row, text)
+        return number
+
+    def _set_raw(self, row, text):
+        if self.raw is None:
+            if text is None:
+                return
+            self.raw = [None] * len(self.values)
+        self.raw[row] = text
+
+    def _text(self, value):
+        """Canonical text for a stored number (an int field promoted to floats still prints 36)."""
+        if self.kind != "float" and isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def _missing(self):
+        return math.nan if self.is_float else MISSING_INT
+
+    def append(self, text):
+        if not self.numeric:
+            self.values.append(text)
+            self._text_numbers = None
+            return
+        row = len(self.values)
+        self.values.append(self._missing())   # reserve the slot (may be promoted below)
+        if self.raw is not None:
+            self.raw.append(None)
+        number = self._encode(row, text)
+        if number is not None:
+            self.values[row] = number
+
+    def set(self, row, text):
+        if not self.numeric:
+            self.values[row] = text
+            self._text_numbers = None
+            return
+        number = self._encode(row, text)
+        self.values[row] = self._missing() if number is None else number
+
+    def get(self, row):
+        """Original text (None if the attribute is missing)."""
+        if not self.numeric:
+            return self.values[row]
+        text = self.raw[row] if self.raw is not None else None
+        if text is not None:
+            return text
+        value = self.values[row]
+        if value == MISSING_INT or value != value:   # NaN != NaN
+            return None
+        return self._text(value)
+
+    def texts(self):
+        return [self.get(row) for row in range(len(self.values))]
+
+    def keep_rows(self, keep):
+        """Drop every row not in `keep` (sorted row numbers), renumbering raw/invalid."""
+        new_row = {old: new for new, old in enumerate(keep)}
+        values = self.values
+        if self.numeric:
+            self.values = array(values.typecode, (values[i] for i in keep))
+        else:
+            self.values = [values[i] for i in keep]
+            self._text_numbers = None
+        if self.raw is not None:
+            raw = self.raw
+            self.raw = [raw[i] for i in keep]
+        self.invalid = {new_row[r] for r in self.invalid if r in new_row}
+
+
+class CompanyStore:
+    """
+    Column-per-field read model of the <Company> elements (table, tableview,
+    analysis and export read from here). The elements stay the write model and
+    the serialization source; every mutation goes through the element first and
+    is then mirrored with refresh_company / append_company / remove_companies.
+    """
+
+    def __init__(self, xml_root=None):
+        self.xml_root = xml_root
+        self.elements = []     # row → <Company>
+        self.row_of = {}       # <Company> → row
+        self.id_rows = {}      # ID (str) → row, first one wins on duplicates
+        self.columns = {}      # column name → StoreColumn (document column order)
+        self.stamps = array("q")   # row → change stamp (bumped whenever that company's values change)
+        self.last_stamp = 0
+
+    @classmethod
+    def from_xml(cls, xml_root):
+        store = cls(xml_root)
+        if xml_root is None:
+            return store
+        store.elements = xml_root.findall("Company")
+        columns, _ = collect_company_columns(xml_root)
+        store.columns = {name: StoreColumn.from_values(name, values) for name, values in columns.items()}
+        store.stamps = array("q", [0]) * len(store.elements)
+        store._reindex_rows()
+        return store
+
+    def __len__(self):
+        return len(self.elements)
+
+    def _reindex_rows(self):
+        self.row_of = {company: row for row, company in enumerate(self.elements)}
+        self.id_rows = {}
+        ids = self.columns.get("ID")
+        if ids is not None:
+            for row in range(len(self.elements)):
+                self.id_rows.setdefault(ids.get(row) or "", row)
+
+    # 🔎 Reads
+    def row_for_id(self, company_id):
+        return self.id_rows.get(str(company_id))
+
+    def get(self, column, row, default=""):
+        col = self.columns.get(column)
+        if col is None:
+            return default
+        value = col.get(row)
+        return default if value is None else value
+
+    def stamp(self, row):
+        """Change stamp of a row: equal stamps mean nothing in that company changed."""
+        return self.stamps[row]
+
+    def _touch(self, row):
+        self.last_stamp += 1
+        self.stamps[row] = self.last_stamp
+
+    def getter(self, column):
+        """row → text (None if missing) for one column; cheap to call in loops."""
+        col = self.columns.get(column)
+        return col.get if col is not None else (lambda row: None)
+
+    def field_value(self, field_key, row):
+        """Raw text for a FIELD_TYPES key ("" if missing)."""
+        return self.get(store_column_name(field_key), row)
+
+    # ✏️ Mirroring element changes
+    def _column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = StoreColumn(name, column_kind(name), len(self.elements))
+        return column
+
+    @staticmethod
+    def _element_values(company):
+        values = dict(company.attrib)
+        for child in company:
+            for key, value in child.attrib.items():
+                values[f"{child.tag}_{key}"] = value
+        return values
+
+    def refresh_company(self, company):
+        """Re-read one element into its row (after edits, generic AI, ...)."""
+        row = self.row_of.get(company)
+        if row is None:
+            return
+        old_id = self.get("ID", row, None)
+        values = self._element_values(company)
+        for name, column in self.columns.items():
+            column.set(row, values.pop(name, None))
+        for name, value in values.items():
+            self._column(name).set(row, value)
+        self._touch(row)
+        if old_id != company.get("ID"):
+            self._reindex_rows()
+
+    def append_company(self, company):
+        row = len(self.elements)
+        self.elements.append(company)
+        self.row_of[company] = row
+        self.stamps.append(0)
+        self._touch(row)
+        values = self._element_values(company)
+        for name, column in self.columns.items():
+            column.append(values.pop(name, None))
+        for name, value in values.items():
+            self._column(name).set(row, value)   # new column was created one row long
+        self.id_rows.setdefault(company.get("ID", ""), row)
+
+    def remove_companies(self, companies):
+        """Drop rows for removed elements (one pass over every column)."""
+        removed = {self.row_of[c] for c in companies if c in self.row_of}
+        if not removed:
+            return
+        keep = [row for row in range(len(self.elements)) if row not in removed]
+        self.elements = [self.elements[row] for row in keep]
+        self.stamps = array("q", (self.stamps[row] for row in keep))
+        for column in self.columns.values():
+            column.keep_rows(keep)
+        self._reindex_rows()
+
+    def refresh_columns(self, names):
+        """Re-read a few attributes for every row (e.g. ID/OwnerID after a reindex)."""
+        for name in names:
+            section, sep, attr = name.partition("_")   # "Funds_OnHand" vs company attribute "OwnerID"
+            column = self._column(name)
+            for row, company in enumerate(self.elements):
+                if not sep:
+                    value = company.get(name)
+                else:
+                    elem = company.find(section)
+                    value = elem.get(attr) if elem is not None else None
+                if column.get(row) != value:
+                    column.set(row, value)
+                    self._touch(row)
+        if "ID" in names:
+            self._reindex_rows()
+
+
+def get_company_store(editor):
+    """The editor's store for its current xml_root (built on first use or after a root swap)."""
+    xml_root = getattr(editor, "xml_root", None)
+    store = getattr(editor, "company_store", None)
+    if store is None or store.xml_root is not xml_root:
+        store = editor.company_store = CompanyStore.from_xml(xml_root)
+    return store
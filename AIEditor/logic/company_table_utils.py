@@ -2,6 +2,8 @@
 import xml.etree.ElementTree as ET
 
 # import from different files
+from AIEditor.logic.dirty_tracking import set_attr, mark_company_dirty
+from AIEditor.logic.company_store import get_company_store, store_column_name
 from AIEditor.settings.config import (
     FIELD_LAYOUT,
     CREDIT_MAP,
@@ -10,6 +12,9 @@ from AIEditor.settings.config import (
     GENERIC_MAP_REV,
 )
 
+# Company Treeview columns (also the order of each row's sort_keys)
+COMPANY_TABLE_COLUMNS = ("ID", "Name", "Owner", "HQ", "Founded", "Death", "Funds")
+
 
 def get_companies(self):
     """Return company elements from xml_root or an empty list."""
@@ -18,58 +23,236 @@ def get_companies(self):
     return list(self.xml_root.findall("Company"))
 
 
+def map_label(map_dict, raw):
+    """Label for an ID stored as text: map_dict[int(raw)] or map_dict[raw], else raw itself."""
+    if not raw:
+        return ""
+    try:
+        return map_dict.get(int(raw), raw)
+    except (TypeError, ValueError):
+        return map_dict.get(raw, raw)
+
+
+class CompanyRow:
+    """
+    One company as shown in the Treeview/Tableview. Rows are cached per company
+    (see build_company_rows) and only rebuilt when the store stamp of that company
+    changes or the Owner/HQ label it shows is no longer what the maps say.
+    """
+    __slots__ = (
+        "id", "name", "owner_id", "owner_name", "hq_id", "hq_name",
+        "founded", "death", "funds_display", "sort_keys", "values", "stamp",
+        "tableview_key", "tableview_values",
+    )
+
+    def __init__(self, store_getters, idx, stamp, company_map, city_map):
+        get_id, get_name, get_owner, get_hq, get_founded, get_death, get_funds = store_getters
+        self.stamp = stamp
+        self.id = get_id(idx) or ""
+        self.name = get_name(idx) or ""
+        self.owner_id = get_owner(idx) or ""
+        self.owner_name = map_label(company_map, self.owner_id) or ""
+        self.hq_id = get_hq(idx) or ""
+        self.hq_name = map_label(city_map, self.hq_id) or ""
+        self.founded = get_founded(idx) or ""
+        self.death = get_death(idx) or ""
+
+        funds_raw = get_funds(idx)
+        if funds_raw is None:
+            funds_raw = "0"
+        try:
+            self.funds_display = f"${int(funds_raw):,}"
+        except (TypeError, ValueError):
+            self.funds_display = funds_raw
+
+        # Treeview values and typed sort keys, both in COMPANY_TABLE_COLUMNS order
+        self.values = (
+            self.id, self.name, self.owner_name, self.hq_name,
+            self.founded, self.death, self.funds_display,
+        )
+        self.sort_keys = (
+            typed_sort_key(self.id),
+            typed_sort_key(self.name),
+            typed_sort_key(self.owner_name),
+            typed_sort_key(self.hq_name),
+            typed_sort_key(self.founded),
+            typed_sort_key(self.death),
+            typed_sort_key(funds_raw),
+        )
+        self.tableview_key = None
+        self.tableview_values = None
+
+    def labels_match(self, company_map, city_map):
+        """True if the Owner/HQ labels are still what the (new) maps would give."""
+        return (
+            (map_label(company_map, self.owner_id) or "") == self.owner_name
+            and (map_label(city_map, self.hq_id) or "") == self.hq_name
+        )
+
+
+# Store columns a CompanyRow reads (company_row_getters order)
+COMPANY_ROW_COLUMNS = ("ID", "Name", "OwnerID", "HQ", "Founded", "Death", "Funds_OnHand")
+
+def company_row_getters(store):
+    return tuple(store.getter(column) for column in COMPANY_ROW_COLUMNS)
+
+def company_rows_show_fields(fields, tableview_field_key):
+    """True if any of these FIELD_TYPES keys is shown by the Treeview or the Tableview column."""
+    shown = set(COMPANY_ROW_COLUMNS)
+    shown.add(store_column_name(tableview_field_key))
+    return any(store_column_name(field_key) in shown for field_key in fields)
+
+
+def row_cache_maps_match(self, cache):
+    """True if the cached rows were labelled with the editor's current company/city maps."""
+    return (
+        cache["company_map"] is getattr(self, "company_map", None)
+        and cache["company_map_version"] == getattr(self, "company_map_version", 0)
+        and cache["city_map"] is getattr(self, "city_map", None)
+    )
+
+
 def build_company_rows(self):
-    """Build normalized company rows used by both Treeview and Tableview."""
+    """
+    Company rows (CompanyRow, document order) used by both Treeview and Tableview.
+    Unchanged companies reuse their cached row, so a refresh after one edit
+    allocates one row instead of one per company.
+    """
+    store = get_company_store(self)
+    company_map = getattr(self, "company_map", {}) or {}
+    city_map = getattr(self, "city_map", {}) or {}
+    company_map_version = getattr(self, "company_map_version", 0)
+
+    cache = getattr(self, "company_row_cache", None)
+    if cache is None or cache["store"] is not store:
+        cache = self.company_row_cache = {
+            "store": store, "company_map": None, "company_map_version": None, "city_map": None, "rows": {}, "list": [],
+        }
+    maps_changed = not row_cache_maps_match(self, cache)
+    cache["company_map"] = getattr(self, "company_map", None)
+    cache["company_map_version"] = company_map_version
+    cache["city_map"] = getattr(self, "city_map", None)
+
+    cached_rows = cache["rows"]   # <Company> element → CompanyRow
+    previous = cache["list"]
+    stamps = store.stamps
+    getters = None
     rows = []
+    changed = len(previous) != len(store)
+
+    for idx, company in enumerate(store.elements):
+        row = cached_rows.get(company)
+        if row is None or row.stamp != stamps[idx] or (maps_changed and not row.labels_match(company_map, city_map)):
+            if getters is None:
+                getters = company_row_getters(store)
+            row = cached_rows[company] = CompanyRow(getters, idx, stamps[idx], company_map, city_map)
+        if not changed and previous[idx] is not row:
+            changed = True
+        rows.append(row)
+
+    if not changed:
+        return previous   # ♻️ nothing changed → same list object as last time
+
+    if len(cached_rows) > len(rows):
+        # 🧹 companies were removed → forget their rows
+        cache["rows"] = {company: cached_rows[company] for company in store.elements}
+    cache["list"] = rows
+    return rows
+
+
+def refresh_company_row(self, company):
+    """
+    Rebuild the cached row of one edited company in place (cache list included).
+    Returns the new CompanyRow, or None when the cache doesn't line up with the
+    store / maps any more and build_company_rows has to run instead.
+    """
+    store = get_company_store(self)
+    cache = getattr(self, "company_row_cache", None)
+    if cache is None or cache["store"] is not store or len(cache["list"]) != len(store):
+        return None
+    if not row_cache_maps_match(self, cache):
+        return None
     company_map = getattr(self, "company_map", {}) or {}
     city_map = getattr(self, "city_map", {}) or {}
 
-    for company in get_companies(self):
-        cid = company.get("ID", "")
-        cname = company.get("Name", "")
-        owner_id = company.get("OwnerID")
-
-        # Convert owner ID -> owner name
-        owner_name = ""
-        if owner_id:
-            try:
-                owner_name = company_map.get(int(owner_id), owner_id)
-            except (TypeError, ValueError):
-                owner_name = company_map.get(owner_id, owner_id)
-
-        # Convert HQ ID -> city display
-        hq_id = company.get("HQ", "")
-        if hq_id:
-            try:
-                hq_name = city_map.get(int(hq_id), hq_id)
-            except (TypeError, ValueError):
-                hq_name = city_map.get(hq_id, hq_id)
+    idx = store.row_of.get(company)
+    if idx is None:
+        return None
+    row = CompanyRow(company_row_getters(store), idx, store.stamps[idx], company_map, city_map)
+    cache["rows"][company] = row
+    cache["list"][idx] = row
+    return row
+
+
+def typed_sort_key(value):
+    """(0, number) for numeric values, (1, lowercase text) otherwise, so mixed columns still sort."""
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, "" if value is None else str(value).lower())
+
+
+def sort_company_rows(company_rows, sort_state):
+    """Return rows ordered by sort_state = (column, reverse), or unchanged if None."""
+    if not sort_state:
+        return company_rows
+    col, reverse = sort_state
+    if col not in COMPANY_TABLE_COLUMNS:
+        return company_rows
+    col_idx = COMPANY_TABLE_COLUMNS.index(col)
+    return sorted(company_rows, key=lambda row: row.sort_keys[col_idx], reverse=reverse)
+
+
+def company_table_values(row):
+    """Treeview values tuple for one company row."""
+    return row.values
+
+
+def sync_company_table(table, company_rows, row_cache, start_index=0):
+    """
+    Keyed refresh of the company Treeview (iid = company ID).
+    - Inserts new rows, updates rows whose values/stripe changed, deletes stale ones.
+    - Reorders with a single set_children call only when the order differs.
+    - row_cache maps iid -> (values, tag) for what Tk currently shows.
+    - start_index is the absolute position of company_rows[0] (keeps striping stable).
+    Returns the list of iids that were inserted or updated.
+    """
+    desired = []
+    seen = set()
+    changed = []
+
+    for idx, row in enumerate(company_rows):
+        iid = row.id
+        if iid in seen:
+            # duplicate IDs in the XML still need unique Treeview iids
+            iid = f"{iid}~{start_index + idx}"
+        seen.add(iid)
+        desired.append(iid)
+
+        values = row.values
+        tag = "evenrow" if (start_index + idx) % 2 == 0 else "oddrow"
+        cached = row_cache.get(iid)
+
+        if cached is None:
+            table.insert("", "end", iid=iid, values=values, tags=(tag,))
+        elif cached[0] is not values and cached[0] != values or cached[1] != tag:
+            table.item(iid, values=values, tags=(tag,))
         else:
-            hq_name = ""
+            continue
 
-        founded = company.get("Founded", "")
-        death = company.get("Death", "")
+        row_cache[iid] = (values, tag)
+        changed.append(iid)
 
-        funds_elem = company.find("Funds")
-        funds_raw = funds_elem.get("OnHand") if funds_elem is not None else "0"
-        try:
-            funds_display = f"${int(funds_raw):,}"
-        except (TypeError, ValueError):
-            funds_display = funds_raw if funds_raw is not None else ""
-
-        rows.append(
-            {
-                "id": str(cid) if cid is not None else "",
-                "name": cname or "",
-                "owner_name": owner_name or "",
-                "hq_name": hq_name or "",
-                "founded": founded or "",
-                "death": death or "",
-                "funds_display": funds_display or "",
-            }
-        )
+    stale = [iid for iid in row_cache if iid not in seen]
+    if stale:
+        table.delete(*stale)
+        for iid in stale:
+            del row_cache[iid]
 
-    return rows
+    if table.get_children() != tuple(desired):
+        table.set_children("", *desired)
+
+    return changed
 
 
 def build_tableview_column_options():
@@ -140,45 +323,68 @@ def format_tableview_value(field_key, raw_value, company_map, city_map):
 def build_tableview_rows(self, company_rows, extra_field_key):
     """Build Tableview row tuples in (ID, Name, extra) order."""
     rows = []
-    companies = get_companies(self)
+    store = get_company_store(self)
     company_map = getattr(self, "company_map", {}) or {}
     city_map = getattr(self, "city_map", {}) or {}
     pending_edits = getattr(self, "tableview_pending_edits", {}) or {}
 
-    for idx, row in enumerate(company_rows):
-        company_id = str(row["id"])
-        pending_key = (company_id, extra_field_key)
-        if pending_key in pending_edits:
-            extra_value = pending_edits[pending_key]
-            rows.append((row["id"], row["name"], extra_value))
-            continue
+    # One column lookup for the whole table instead of company.find(section) per row
+    if "_" in extra_field_key:
+        get_value = store.getter(store_column_name(extra_field_key))
+    else:
+        get_value = lambda idx: None
 
-        company = companies[idx] if idx < len(companies) else None
-        if company is None:
-            extra_value = ""
-        else:
-            extra_value = get_company_field_value(company, extra_field_key, company_map, city_map)
+    for row in company_rows:
+        if pending_edits and (row.id, extra_field_key) in pending_edits:
+            rows.append((row.id, row.name, pending_edits[(row.id, extra_field_key)]))
+            continue
 
-        rows.append((row["id"], row["name"], extra_value))
+        # ♻️ Cached on the row; a changed company gets a fresh CompanyRow anyway
+        if row.tableview_key != extra_field_key:
+            store_row = store.row_for_id(row.id)
+            if store_row is None:
+                extra_value = ""
+            else:
+                extra_value = format_tableview_value(extra_field_key, get_value(store_row), company_map, city_map)
+            row.tableview_key = extra_field_key
+            row.tableview_values = (row.id, row.name, extra_value)
+        rows.append(row.tableview_values)
 
     return rows
 
 
-def parse_tableview_input(field_key, text, company_map, city_map):
+def build_reverse_map(map_dict):
+    """
+    {ID: label} → {label (str): ID}.
+    Duplicate labels resolve to the first ID in map order (what a linear scan found).
+    """
+    reverse = {}
+    for cid, label in map_dict.items():
+        reverse.setdefault(str(label), cid)
+    return reverse
+
+
+def lookup_label_id(label, map_dict, reverse_map=None):
+    """ID for a display label, or None. Falls back to a scan when no reverse map is given."""
+    if reverse_map is not None:
+        return reverse_map.get(str(label))
+    for cid, cname in map_dict.items():
+        if str(cname) == label:
+            return cid
+    return None
+
+
+def parse_tableview_input(field_key, text, company_map, city_map, company_map_rev=None, city_map_rev=None):
     """Parse tableview display input into raw XML-storable value."""
     raw = "" if text is None else str(text).strip()
 
     if field_key == "Company_OwnerID":
-        for cid, cname in company_map.items():
-            if str(cname) == raw:
-                return str(cid)
-        return raw
+        cid = lookup_label_id(raw, company_map, company_map_rev)
+        return raw if cid is None else str(cid)
 
     if field_key == "Company_HQ":
-        for cid, cname in city_map.items():
-            if str(cname) == raw:
-                return str(cid)
-        return raw
+        cid = lookup_label_id(raw, city_map, city_map_rev)
+        return raw if cid is None else str(cid)
 
     if field_key == "Funds_Credit":
         return str(CREDIT_MAP.get(raw, raw))
@@ -189,8 +395,8 @@ def parse_tableview_input(field_key, text, company_map, city_map):
     return raw
 
 
-def write_company_field(company, field_key, raw_value):
-    """Write one field key (Company_X or Section_X) into XML."""
+def write_company_field(company, field_key, raw_value, dirty_ids=None):
+    """Write one field key (Company_X or Section_X) into XML, flagging the company in dirty_ids."""
     if "_" not in field_key:
         return False, f"Invalid field key '{field_key}'."
 
@@ -199,13 +405,15 @@ def write_company_field(company, field_key, raw_value):
     if section == "Company":
         if attr == "ID":
             return False, "Company ID is read-only."
-        company.set(attr, str(raw_value))
+        if set_attr(company, attr, raw_value):
+            mark_company_dirty(dirty_ids, company)
         return True, ""
 
     elem = company.find(section)
     if elem is None:
         elem = ET.SubElement(company, section)
-    elem.set(attr, str(raw_value))
+    if set_attr(elem, attr, raw_value):
+        mark_company_dirty(dirty_ids, company)
     return True, ""
 
 
@@ -0,0 +1,12 @@
+def set_attr(elem, attr, value):
+    """Set an XML attribute; return True only if the stored value actually changed."""
+    value = str(value)
+    if elem.get(attr) == value:
+        return False
+    elem.set(attr, value)
+    return True
+
+def mark_company_dirty(dirty_ids, company):
+    """Flag a <Company> as changed since the last save (dirty_ids may be None)."""
+    if dirty_ids is not None:
+        dirty_ids.add(company.get("ID", ""))
@@ -0,0 +1,155 @@
+# import from packages
+import mmap
+import os
+import re
+
+# import from different files
+from AIEditor.logic.xml_utils import atomic_write, serialize_element
+
+# <Company ...> / <Company .../> start tag (quoted attribute values may contain '>')
+COMPANY_START_RE = re.compile(rb"""<Company\b(?:[^>"']|"[^"]*"|'[^']*')*?(/?)>""")
+COMPANY_END_RE = re.compile(rb"</Company\s*>")
+COMPANY_ID_RE = re.compile(rb"""\sID\s*=\s*(["'])(.*?)\1""")
+XML_DECL_RE = re.compile(rb"""^(?:\xef\xbb\xbf)?<\?xml\b[^>]*?\bencoding\s*=\s*(["'])([A-Za-z0-9._-]+)\1""")
+
+# Declared encoding → codec the patches are encoded with (non-ASCII becomes &#...; in ASCII files)
+PATCHABLE_ENCODINGS = {"utf-8": "utf-8", "utf8": "utf-8", "us-ascii": "ascii", "ascii": "ascii"}
+
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def file_signature(file_path):
+    """(size, mtime) used to detect that a file changed behind our back."""
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def declared_encoding(data):
+    """Encoding named in the XML declaration (lowercase), or None if there isn't one."""
+    match = XML_DECL_RE.match(data[:1024])
+    return match.group(2).decode("ascii").lower() if match else None
+
+
+def scan_company_spans(file_path, xml_root):
+    """
+    Record the byte span of every top-level <Company> in file_path.
+    Returns {"path", "signature", "encoding", "spans": {<Company> element: (start, end)}},
+    or None when the raw bytes don't line up with the parsed companies
+    (comments/CDATA containing <Company, nested companies, ...) or when the file
+    isn't UTF-8 or ASCII (a Latin-1 file can't take UTF-8 patches → full save instead).
+    """
+    companies = xml_root.findall("Company")
+    if not companies:
+        return None
+
+    signature = file_signature(file_path)
+    spans = {}
+
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+                return None   # UTF-16
+            encoding = PATCHABLE_ENCODINGS.get(declared_encoding(data) or "utf-8")
+            if encoding is None:
+                return None
+
+            pos = 0
+            for company in companies:
+                start_match = COMPANY_START_RE.search(data, pos)
+                if start_match is None:
+                    return None
+
+                id_match = COMPANY_ID_RE.search(start_match.group(0))
+                raw_id = id_match.group(2).decode("utf-8", "replace") if id_match else None
+                if raw_id != company.get("ID"):
+                    return None
+
+                if start_match.group(1):   # self-closing <Company ... />
+                    end = start_match.end()
+                else:
+                    end_match = COMPANY_END_RE.search(data, start_match.end())
+                    if end_match is None:
+                        return None
+                    end = end_match.end()
+
+                spans[company] = (start_match.start(), end)
+                pos = end
+
+            # 🚫 anything company-like left over means the mapping is ambiguous
+            if COMPANY_START_RE.search(data, pos) is not None:
+                return None
+
+    return {"path": file_path, "signature": signature, "encoding": encoding, "spans": spans}
+
+
+def can_patch_save(span_info, dirty_companies):
+    """True if every dirty company has a recorded span and the source file is unchanged."""
+    if not span_info:
+        return False
+    spans = span_info["spans"]
+    if any(company is None or company not in spans for company in dirty_companies):
+        return False
+    try:
+        return file_signature(span_info["path"]) == span_info["signature"]
+    except OSError:
+        return False
+
+
+def copy_byte_range(src, out, start, end):
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        out.write(chunk)
+        remaining -= len(chunk)
+
+
+def encode_company(company, encoding="utf-8"):
+    """Bytes for one <Company> exactly as the full writer would emit it (tail excluded)."""
+    parts = []
+    serialize_element(company, 1, None, parts.append)
+    text = "".join(parts)
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)   # match the text-mode full save
+    return text.encode(encoding, "xmlcharrefreplace")
+
+
+def save_xml_patched(span_info, target_path, dirty_companies):
+    """
+    Re-emit only dirty companies and splice them between the untouched byte ranges
+    of the original file. Writes target_path atomically and returns the new span info.
+    """
+    spans = span_info["spans"]
+    encoding = span_info.get("encoding", "utf-8")
+    patches = sorted(
+        ((spans[company], encode_company(company, encoding)) for company in set(dirty_companies)),
+        key=lambda patch: patch[0][0],
+    )
+
+    with atomic_write(target_path, binary=True) as out:
+        with open(span_info["path"], "rb") as src:
+            pos = 0
+            for (start, end), data in patches:
+                copy_byte_range(src, out, pos, start)
+                out.write(data)
+                pos = end
+            src.seek(0, os.SEEK_END)
+            copy_byte_range(src, out, pos, src.tell())
+
+    # 📐 Shift every span after a patch by the accumulated size difference
+    new_spans = {}
+    shifts = [(start, len(data) - (end - start)) for (start, end), data in patches]
+    delta = 0
+    next_shift = 0
+    for company, (start, end) in spans.items():   # spans are kept in document order
+        while next_shift < len(shifts) and shifts[next_shift][0] < start:
+            delta += shifts[next_shift][1]
+            next_shift += 1
+        if next_shift < len(shifts) and shifts[next_shift][0] == start:
+            new_spans[company] = (start + delta, end + delta + shifts[next_shift][1])
+        else:
+            new_spans[company] = (start + delta, end + delta)
+
+    return {"path": target_path, "signature": file_signature(target_path), "encoding": encoding, "spans": new_spans}
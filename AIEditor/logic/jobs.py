@@ -0,0 +1,70 @@
+"""
+Background jobs run through TaskRunner. Each takes a TaskContext first and never
+touches Tk: results go back to the editor's on_done callbacks on the Tk thread.
+"""
+# import from packages
+from types import SimpleNamespace
+
+# import from different files
+from AIEditor.logic.xml_utils import (
+    stream_xml_file,
+    save_xml_to_file,
+    load_city_xml,
+    build_city_map_from_xml,
+    ExportExcel,
+    AnalyzeXML,
+    XMLLoadCancelled,
+)
+from AIEditor.logic.company_store import CompanyStore
+from AIEditor.logic.incremental_save import scan_company_spans, save_xml_patched
+from AIEditor.logic.label_search import LabelSearchIndex
+from AIEditor.logic.task_runner import TaskCancelled
+from AIEditor.logic.timing import timed
+
+
+def load_xml_job(context, file_path):
+    """Parse an AI XML → (root, span_info, company store)."""
+    try:
+        with timed("parse"):
+            root = stream_xml_file(
+                file_path,
+                progress_callback=context.progress,
+                cancel_event=context.cancel_event,
+            )
+    except XMLLoadCancelled:
+        raise TaskCancelled()
+    with timed("scan spans"):
+        span_info = scan_company_spans(file_path, root)
+    with timed("company store"):
+        store = CompanyStore.from_xml(root)
+    return root, span_info, store
+
+
+def save_xml_job(context, xml_root, file_path, span_info, dirty_companies, patch):
+    """Write the XML (patched or in full) → span info for the written file."""
+    if patch:
+        with timed(f"patch {len(dirty_companies)} companies"):
+            return save_xml_patched(span_info, file_path, dirty_companies)
+    with timed("serialize"):
+        save_xml_to_file(xml_root, file_path)
+    with timed("scan spans"):
+        return scan_company_spans(file_path, xml_root)
+
+
+def load_city_job(context, file_path):
+    """Parse a City XML → namespace with city_xml_root, city_map, city_map_rev, city_search."""
+    city = SimpleNamespace(city_xml_root=load_city_xml(file_path))
+    with timed("city map"):
+        build_city_map_from_xml(city)
+    with timed("search index"):
+        city.city_search = LabelSearchIndex(city.city_map.values())
+    return city
+
+
+def export_excel_job(context, xml_root, file_path, store=None):
+    ExportExcel(xml_root, file_path, store=store)
+    return file_path
+
+
+def analyze_job(context, xml_root, store=None):
+    AnalyzeXML(xml_root, store=store)
@@ -0,0 +1,78 @@
+# import from packages
+from collections import defaultdict
+
+# import from different files
+from AIEditor.settings.config import DROPDOWN_SEARCH_LIMIT
+
+GRAM_SIZE = 3
+
+
+class LabelSearchIndex:
+    """
+    Case-insensitive substring search over dropdown labels (city/company names).
+    Queries of GRAM_SIZE+ characters only verify labels sharing the query's rarest
+    trigram; shorter queries match so many labels that a capped scan stops early anyway.
+    Results keep map order.
+    """
+    __slots__ = ("labels", "lowered", "grams")
+
+    def __init__(self, labels):
+        self.labels = [str(label) for label in labels]
+        self.lowered = [label.lower() for label in self.labels]
+        grams = defaultdict(list)
+        for idx, text in enumerate(self.lowered):
+            for gram in {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}:
+                grams[gram].append(idx)
+        self.grams = dict(grams)
+
+    def search(self, query, limit=DROPDOWN_SEARCH_LIMIT):
+        query = (query or "").lower()
+        if not query:
+            return self.labels[:limit]
+
+        if len(query) < GRAM_SIZE:
+            candidates = range(len(self.lowered))
+        else:
+            postings = []
+            for i in range(len(query) - GRAM_SIZE + 1):
+                posting = self.grams.get(query[i:i + GRAM_SIZE])
+                if posting is None:
+                    return []
+                postings.append(posting)
+            candidates = min(postings, key=len)
+
+        results = []
+        for idx in candidates:
+            if query in self.lowered[idx]:
+                results.append(self.labels[idx])
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def get_label_search_index(editor, dropdown_source):
+    """
+    Search index for editor.<dropdown_source>, built on first use.
+    Rebuilt when the map is replaced or its version goes up (company_map is patched in place).
+    """
+    map_dict = getattr(editor, dropdown_source, {}) or {}
+    version = getattr(editor, f"{dropdown_source}_version", 0)
+    cache = getattr(editor, "dropdown_search_indexes", None)
+    if cache is None:
+        cache = editor.dropdown_search_indexes = {}
+
+    cached = cache.get(dropdown_source)
+    if cached is not None and cached[0] is map_dict and cached[2] == version:
+        return cached[1]
+
+    index = LabelSearchIndex(map_dict.values())
+    cache[dropdown_source] = (map_dict, index, version)
+    return index
+
+def set_label_search_index(editor, dropdown_source, index):
+    """Install an index built elsewhere (e.g. in a worker) for the current map."""
+    cache = getattr(editor, "dropdown_search_indexes", None)
+    if cache is None:
+        cache = editor.dropdown_search_indexes = {}
+    map_dict = getattr(editor, dropdown_source, {}) or {}
+    cache[dropdown_source] = (map_dict, index, getattr(editor, f"{dropdown_source}_version", 0))
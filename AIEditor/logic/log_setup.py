@@ -0,0 +1,50 @@
+# import from packages
+import logging
+import os
+
+# import from different files
+from AIEditor.settings.config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT
+
+ROOT_LOGGER = "AIEditor"
+_handler = None
+
+
+def parse_module_levels(text):
+    """'ui_utils=DEBUG,AIEditor.ui=INFO' → {"AIEditor.logic.ui_utils": "DEBUG", "AIEditor.ui": "INFO"}"""
+    levels = {}
+    for item in (text or "").split(","):
+        name, sep, level = item.partition("=")
+        name, level = name.strip(), level.strip()
+        if not sep or not name or not level:
+            continue
+        if not name.startswith(ROOT_LOGGER):
+            name = f"{ROOT_LOGGER}.logic.{name}"
+        levels[name] = level.upper()
+    return levels
+
+
+def configure_logging(level=None, module_levels=None):
+    """
+    Attach one stderr handler to the "AIEditor" logger and apply levels.
+    Modules log through logging.getLogger(__name__), so each one can be tuned separately.
+    Safe to call again (e.g. to change levels at runtime).
+    """
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER)
+
+    if _handler is None:
+        _handler = logging.StreamHandler()
+        _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(_handler)
+        root.propagate = False
+
+    level = level or os.environ.get("AIEDITOR_LOG_LEVEL") or LOG_LEVEL
+    root.setLevel(str(level).upper())
+
+    levels = dict(LOG_LEVELS)
+    levels.update(parse_module_levels(os.environ.get("AIEDITOR_LOG_LEVELS")))
+    levels.update(module_levels or {})
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(str(module_level).upper())
+
+    return root
@@ -1,11 +1,15 @@
+import logging
+
 from AIEditor.settings.preset import Funds_Preset, Skills_Preset, Design_Preset, Image_Preset, Behavior_Preset, Aggressions_Preset
 from AIEditor.settings.config import CREDIT_MAP_REV, GENERIC_MAP_REV
 
+logger = logging.getLogger(__name__)
+
 def apply_funds_preset(editor, preset_name):
     """Apply a funds preset using formula with StartYear and Power."""
     preset = Funds_Preset.get(preset_name)
     if not preset:
-        print(f"[DEBUG] Unknown preset: {preset_name}")
+        logger.warning("Unknown funds preset: %s", preset_name)
         return
 
     # --- Step 1: Calculate StartYear ---
@@ -16,7 +20,7 @@ def apply_funds_preset(editor, preset_name):
         founded_val = 1850  # fallback
     start_year = max(0, founded_val - 1850)
 
-    print(f"[DEBUG] Preset={preset_name}, Founded={founded_val}, StartYear={start_year}")
+    logger.debug("Preset=%s, Founded=%s, StartYear=%s", preset_name, founded_val, start_year)
 
     # --- Step 2: Extract preset values ---
     base_start = preset.get("Starting", 0)
@@ -32,18 +36,18 @@ def apply_funds_preset(editor, preset_name):
     # Funds_OnHand
     if "Funds_OnHand" in editor.detail_vars:
         editor.detail_vars["Funds_OnHand"].set(str(funds_onhand))
-        print(f"[DEBUG] Funds_OnHand = {funds_onhand}")
+        logger.debug("Funds_OnHand = %s", funds_onhand)
 
     # Funds_Loans
     if "Funds_Loans" in editor.detail_vars:
         editor.detail_vars["Funds_Loans"].set(str(funds_loans))
-        print(f"[DEBUG] Funds_Loans = {funds_loans}")
+        logger.debug("Funds_Loans = %s", funds_loans)
 
     # Funds_Credit
     if "Funds_Credit" in editor.detail_vars:
         credit_label = CREDIT_MAP_REV.get(credit_num, "D")
         editor.detail_vars["Funds_Credit"].set(credit_label)
-        print(f"[DEBUG] Credit mapped {credit_num} → {credit_label}")
+        logger.debug("Credit mapped %s → %s", credit_num, credit_label)
 
 def apply_simple_preset(editor, preset_name, preset_dict, prefix=""):
     """
@@ -52,10 +56,10 @@ def apply_simple_preset(editor, preset_name, preset_dict, prefix=""):
     """
     preset = preset_dict.get(preset_name)
     if not preset:
-        print(f"[DEBUG] Unknown preset: {preset_name}")
+        logger.warning("Unknown preset: %s", preset_name)
         return
 
-    print(f"[DEBUG] Applying simple preset={preset_name} with prefix={prefix}")
+    logger.debug("Applying simple preset=%s with prefix=%s", preset_name, prefix)
 
     for field, value in preset.items():
         key = f"{prefix}{field}" if prefix else field
@@ -64,12 +68,12 @@ def apply_simple_preset(editor, preset_name, preset_dict, prefix=""):
                 generic_num = preset.get("GenericDesigner",0)
                 generic_label = GENERIC_MAP_REV.get(generic_num, "Random")
                 editor.detail_vars[key].set(generic_label)
-                print(f"[DEBUG] Generic Designer mapped {generic_num} → {generic_label}")
+                logger.debug("Generic Designer mapped %s → %s", generic_num, generic_label)
             else:
                 editor.detail_vars[key].set(str(value))
-                print(f"[DEBUG] {key} = {value}")
+                logger.debug("%s = %s", key, value)
         else:
-            print(f"[DEBUG] Skipped missing field: {key}")
+            logger.debug("Skipped missing field: %s", key)
 
 PRESET_CONFIG = {
     "Funds_Preset": {
@@ -0,0 +1,187 @@
+# import from packages
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# import from different files
+from AIEditor.settings.config import TASK_WORKERS, TASK_POLL_MS
+from AIEditor.logic.timing import timed, attach_span
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a job (e.g. via TaskContext.check_cancelled) to stop it early."""
+
+
+class TaskContext:
+    """Handed to every job as its first argument: progress reporting and cancellation."""
+    __slots__ = ("task_id", "cancel_event", "_queue")
+
+    def __init__(self, task_id, cancel_event, result_queue):
+        self.task_id = task_id
+        self.cancel_event = cancel_event
+        self._queue = result_queue
+
+    def progress(self, fraction, message=None):
+        self._queue.put((self.task_id, "progress", (fraction, message)))
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+
+class Task:
+    """One submitted job. Callbacks always run on the Tk thread."""
+    __slots__ = (
+        "id", "name", "message", "cancellable", "cancel_event", "started",
+        "span", "on_done", "on_error", "on_progress", "on_cancel",
+    )
+
+    def __init__(self, task_id, name, message, cancellable, on_done, on_error, on_progress, on_cancel):
+        self.id = task_id
+        self.name = name
+        self.message = message
+        self.cancellable = cancellable
+        self.cancel_event = threading.Event()
+        self.started = time.perf_counter()
+        self.span = None   # worker-side timing span (see task_timing)
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class TaskRunner:
+    """
+    Run jobs on a small thread pool and hand their results back to Tk.
+    Workers only talk to a queue; widget.after() drains it, so every callback
+    (on_done/on_error/on_progress/on_cancel/on_change) runs on the Tk thread.
+    Threads rather than processes: jobs work on the live ElementTree.
+    """
+
+    def __init__(self, widget, on_change=None, max_workers=TASK_WORKERS, poll_ms=TASK_POLL_MS):
+        self.widget = widget
+        self.on_change = on_change
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aieditor-task")
+        self.queue = queue.Queue()
+        self.tasks = {}
+        self._ids = itertools.count(1)
+        self._polling = False
+        self._closed = False
+
+    def submit(self, name, func, *args, message=None, cancellable=False,
+               on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        """Run func(context, *args) in the pool. Returns the Task."""
+        task = Task(next(self._ids), name, message or name, cancellable,
+                    on_done, on_error, on_progress, on_cancel)
+        context = TaskContext(task.id, task.cancel_event, self.queue)
+        self.tasks[task.id] = task
+
+        def worker():
+            try:
+                with timed(name, publish=False) as span:
+                    result = func(context, *args)
+                task.span = span
+                self.queue.put((task.id, "done", result))
+            except TaskCancelled:
+                self.queue.put((task.id, "cancelled", None))
+            except Exception as e:
+                logger.exception("Task %s failed", name)
+                self.queue.put((task.id, "error", e))
+
+        self.executor.submit(worker)
+        self._notify_change()
+        self._schedule_poll()
+        return task
+
+    def is_busy(self, *names):
+        """True if any task (or any task with one of these names) is still running."""
+        if not names:
+            return bool(self.tasks)
+        return any(task.name in names for task in self.tasks.values())
+
+    def running(self):
+        return list(self.tasks.values())
+
+    def cancel_all(self):
+        for task in self.tasks.values():
+            if task.cancellable:
+                task.cancel()
+
+    def shutdown(self):
+        """Window closing: stop cancellable jobs, drop queued ones and stop polling."""
+        self._closed = True
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.on_change = None
+
+    # 🔁 Tk side
+    def _schedule_poll(self):
+        if not self._polling and not self._closed:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        if self._closed:
+            return   # the widget may already be destroyed; results are dropped
+        while True:
+            try:
+                task_id, kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+
+            if kind == "progress":
+                if task.on_progress:
+                    task.on_progress(task, *payload)
+                continue
+
+            del self.tasks[task_id]
+            self._notify_change()
+            callback = {"done": task.on_done, "error": task.on_error, "cancelled": task.on_cancel}[kind]
+            if callback is None:
+                continue
+            try:
+                if kind == "cancelled":
+                    callback(task)
+                else:
+                    callback(task, payload)
+            except Exception:
+                logger.exception("Callback for task %s failed", task.name)
+
+        if self.tasks:
+            self._schedule_poll()
+
+    def _notify_change(self):
+        if self.on_change:
+            self.on_change()
+
+
+@contextmanager
+def task_timing(task):
+    """Tk-thread span from submit to completion, with the worker's own steps attached."""
+    with timed(task.name, start=task.started) as span:
+        if task.span is not None:
+            for child in task.span.children:
+                attach_span(child)
+        yield span
+
+def record_task_timing(task):
+    """Publish a finished task's timing when the Tk side has nothing more to do."""
+    with task_timing(task):
+        pass
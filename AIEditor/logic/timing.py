@@ -0,0 +1,151 @@
+# import from packages
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+# import from different files
+from AIEditor.settings.config import TIMING_ENABLED, TIMING_LOG_PATH
+
+logger = logging.getLogger(__name__)
+
+_enabled = TIMING_ENABLED
+_log_path = TIMING_LOG_PATH
+_local = threading.local()
+_listeners = []
+_last_operation = None
+
+
+class Span:
+    """One timed step; children are the spans opened while it was running."""
+    __slots__ = ("name", "start", "duration", "children")
+
+    def __init__(self, name, start=None):
+        self.name = name
+        self.start = time.perf_counter() if start is None else start
+        self.duration = None
+        self.children = []
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "ms": round((self.duration or 0.0) * 1000, 3),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _NullTimer:
+    """Shared no-op context used while timing is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("span", "publish")
+
+    def __init__(self, span, publish):
+        self.span = span
+        self.publish = publish
+
+    def __enter__(self):
+        _stack().append(self.span)
+        return self.span
+
+    def __exit__(self, *exc):
+        span = self.span
+        span.duration = time.perf_counter() - span.start
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].children.append(span)
+        elif self.publish:
+            _publish(span)
+        return False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def timed(name, start=None, publish=True):
+    """
+    with timed("save"): ...
+    Nested calls on the same thread become children of the open span.
+    A finished top-level span is the "last operation" (publish=False keeps it private,
+    e.g. a worker step that the Tk thread attaches later). start= backdates the span.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(Span(name, start), publish)
+
+
+def attach_span(span):
+    """Add a span finished elsewhere (e.g. in a worker thread) to the current span."""
+    if span is None:
+        return
+    stack = _stack()
+    if stack:
+        stack[-1].children.append(span)
+
+
+def _publish(span):
+    global _last_operation
+    _last_operation = span
+    if _log_path:
+        append_timing_log(span, _log_path)
+    for listener in list(_listeners):
+        listener(span)
+
+
+def append_timing_log(span, log_path):
+    record = span.to_dict()
+    record["time"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    try:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logger.warning("Could not write timing log %s: %s", log_path, e)
+
+
+def add_timing_listener(callback):
+    """callback(span) runs on the thread that closed a published span."""
+    _listeners.append(callback)
+
+def remove_timing_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+def set_timing_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+def set_timing_log(log_path):
+    global _log_path
+    _log_path = log_path
+
+def last_operation():
+    return _last_operation
+
+
+def format_span(span, max_children=6):
+    """'save 812 ms · serialize 640 · scan spans 150' for the status bar."""
+    if span is None:
+        return ""
+    text = f"{span.name} {span.duration * 1000:.0f} ms"
+    children = sorted(span.children, key=lambda child: child.duration or 0.0, reverse=True)
+    parts = [f"{child.name} {child.duration * 1000:.0f}" for child in children[:max_children]]
+    if parts:
+        text += " · " + " · ".join(parts)
+    return text
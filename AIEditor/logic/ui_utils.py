@@ -1,4 +1,7 @@
 # import from packages
+import heapq
+import logging
+from contextlib import contextmanager
 import tkinter as tk
 import ttkbootstrap as ttk
 import tkinter.font as tkFont
@@ -7,19 +10,47 @@ import tkinter.font as tkFont
 from style import SPACING, InitialWidth, RowWidth, ROW_COLORS
 from AIEditor.settings.config import (
     max_widths,
+    COLUMN_SAMPLE_THRESHOLD,
+    COLUMN_SAMPLE_SIZE,
+    MEASURE_CACHE_SIZE,
+    DROPDOWN_SEARCH_DELAY_MS,
     FIELD_TYPES,
     CREDIT_MAP,
     GENERIC_MAP,
 )
+from AIEditor.logic.company_index import find_company
+from AIEditor.logic.company_store import get_company_store
+from AIEditor.logic.company_map import ensure_company_map, map_version
+from AIEditor.logic.change_bus import CompanyFieldsChanged
+from AIEditor.logic.CRUD import prepare_main_value
+from AIEditor.logic.timing import timed
+from AIEditor.logic.label_search import get_label_search_index
+from AIEditor.logic.virtual_table import (
+    set_table_rows,
+    use_virtual_table,
+    set_virtual_table_mode,
+    render_virtual_window,
+)
 from AIEditor.logic.company_table_utils import (
+    COMPANY_TABLE_COLUMNS,
     build_company_rows,
+    company_table_values,
+    sort_company_rows,
+    typed_sort_key,
+    sync_company_table,
     build_tableview_column_options,
     build_tableview_rows,
+    refresh_company_row,
+    company_rows_show_fields,
     parse_tableview_input,
+    build_reverse_map,
+    lookup_label_id,
     write_company_field,
     validate_int,
 )
 
+logger = logging.getLogger(__name__)
+
 # 🎛️ UI Utilities
 def get_treeview_font(style):
     font_name = style.lookup("Treeview", "font")
@@ -29,24 +60,66 @@ def get_treeview_font(style):
 
     return tkFont.nametofont(font_name)
 
-def auto_resize_columns(table, style):
+# (font, text) -> pixel width, shared by every table; bounded by MEASURE_CACHE_SIZE
+_MEASURE_CACHE = {}
+
+def measure_text(font_obj, font_key, text):
+    """font_obj.measure with memoization per distinct string and font."""
+    key = (font_key, text)
+    width = _MEASURE_CACHE.get(key)
+    if width is None:
+        width = font_obj.measure(text)
+        if len(_MEASURE_CACHE) >= MEASURE_CACHE_SIZE:
+            _MEASURE_CACHE.clear()   # start over rather than grow with every file opened
+        _MEASURE_CACHE[key] = width
+    return width
+
+def clear_measure_cache():
+    """New file → its cell strings have nothing in common with the old ones."""
+    _MEASURE_CACHE.clear()
+
+def pick_column_texts(values_list, col_idx):
+    """Distinct strings of one column; huge tables only keep the longest few."""
+    texts = {str(values[col_idx]) for values in values_list}
+    if len(values_list) > COLUMN_SAMPLE_THRESHOLD and len(texts) > COLUMN_SAMPLE_SIZE:
+        texts = heapq.nlargest(COLUMN_SAMPLE_SIZE, texts, key=len)
+    return texts
+
+def auto_resize_columns(table, style, values_list=None, width_tracker=None):
+    """
+    Size columns to their widest text.
+    - values_list: row value tuples to (re)measure, e.g. only inserted/changed rows.
+      Defaults to every row in the table.
+    - width_tracker: {column: max width so far}; widths only grow until it is reset.
+    """
     font_obj = get_treeview_font(style)
-    for col in table['columns']:
+    font_key = tuple(sorted(font_obj.actual().items()))
+    if values_list is None:
+        values_list = [table.item(row, "values") for row in table.get_children()]
+    if width_tracker is None:
+        width_tracker = {}
+
+    for col_idx, col in enumerate(table['columns']):
         if col in max_widths:
             # Force fixed width
-            table.column(col, width=max_widths[col], stretch=False)
-        else:
-            # Auto-resize with min/max
-            max_width = font_obj.measure(col) + 20
-            for row in table.get_children():
-                text = str(table.set(row, col))
-                width = font_obj.measure(text)
-                if width > max_width:
-                    max_width = width
+            if width_tracker.get(col) != max_widths[col]:
+                width_tracker[col] = max_widths[col]
+                table.column(col, width=max_widths[col], stretch=False)
+            continue
+
+        # Auto-resize with min/max
+        max_width = width_tracker.get(col) or measure_text(font_obj, font_key, col) + 20
+        for text in pick_column_texts(values_list, col_idx) if values_list else ():
+            width = measure_text(font_obj, font_key, text)
+            if width > max_width:
+                max_width = width
+
+        if width_tracker.get(col) != max_width:
+            width_tracker[col] = max_width
             table.column(col, width=max_width, stretch=True)
 
 def sort_by_column(tree, col, reverse):
-    """Sort Treeview by given column, auto-detecting numeric values (like $1,000)."""
+    """Sort a plain Treeview by given column, auto-detecting numeric values (like $1,000)."""
     try:
         data = [(tree.set(k, col), k) for k in tree.get_children('')]
 
@@ -58,82 +131,86 @@ def sort_by_column(tree, col, reverse):
                 # Detect currency-style strings
                 if s.startswith("$"):
                     s = s.replace("$", "").replace(",", "")
-                    try:
-                        return float(s)
-                    except ValueError:
-                        return s.lower()
 
-                # Otherwise, try normal number conversion
-                try:
-                    return float(s)
-                except ValueError:
-                    return s.lower()
+                return typed_sort_key(s)
 
-            return value
+            return typed_sort_key(value)
 
         data.sort(key=lambda t: convert(t[0]), reverse=reverse)
 
-        for index, (_, k) in enumerate(data):
-            tree.move(k, '', index)
+        # One Tk call instead of a move per row
+        tree.set_children('', *(k for _, k in data))
 
         tree.heading(
             col,
             command=lambda _col=col, _rev=not reverse: sort_by_column(tree, _col, _rev)
         )
 
-        print(f"[DEBUG] Sorted by '{col}', reverse={reverse}")
+        logger.debug("Sorted by %r, reverse=%s", col, reverse)
 
-    except Exception as e:
-        print(f"[DEBUG] sort_by_column error on '{col}': {e}")
+    except Exception:
+        logger.exception("sort_by_column error on %r", col)
 
-def load_company_map(self):
+def sort_company_table(self, col):
     """
-    Parse the XML and return {ID: Name} dict.
-    Example:
-        {1: "Toyota", 2: "Honda", 3: "Renault"}
+    Heading click on the company table: sort the in-memory rows by their typed keys.
+    The sort state is remembered and re-applied by every populate_company_table.
     """
-    company_map = {}
-    for company in self.xml_root.findall("Company"):  # adjust tag as needed
-        cid = int(company.get("ID"))  # or however ID is stored
-        cname = company.get("Name")  # <-- FIXED, use attribute not element
-        company_map[cid] = cname
-    return company_map
+    current = getattr(self, "table_sort", None)
+    reverse = (not current[1]) if current and current[0] == col else False
+    self.table_sort = (col, reverse)
+
+    for column in COMPANY_TABLE_COLUMNS:
+        arrow = ""
+        if column == col:
+            arrow = " ▼" if reverse else " ▲"
+        self.table.heading(column, text=column + arrow)
+
+    populate_company_table(self, getattr(self, "table_rows", None))
 
 def populate_company_table(self, company_rows=None):
     """
-    Repopulate the company table with data from the XML file.
+    Refresh the company table from the XML file, touching only changed rows.
+    Keeps the current selection and scroll position.
+    Very large files only render a window of rows (see virtual_table.py).
     """
     if not getattr(self, "table_available", True):
         return
     if not hasattr(self, "table") or self.table is None:
         return
 
-    # 🧹 Clear old rows
-    for row in self.table.get_children():
-        self.table.delete(row)
-
     if company_rows is None:
         company_rows = build_company_rows(self)
-    if not company_rows:
-        return  # ⛔ No XML loaded yet → nothing to show
+    company_rows = sort_company_rows(company_rows or [], getattr(self, "table_sort", None))
 
-    # ➕ Insert updated company rows
-    for idx, row in enumerate(company_rows):
-        values = (
-            row["id"],
-            row["name"],
-            row["owner_name"],
-            row["hq_name"],
-            row["founded"],
-            row["death"],
-            row["funds_display"],
-        )
+    if not hasattr(self, "company_table_cache"):
+        self.company_table_cache = {}
+
+    if not getattr(self, "column_width_tracker", None):
+        self.column_width_tracker = {}
+
+    set_table_rows(self, company_rows)
+    self.company_table_stale = False
 
-        tag = "evenrow" if idx % 2 == 0 else "oddrow"
-        self.table.insert("", tk.END, values=values, tags=(tag,))
+    if use_virtual_table(company_rows):
+        set_virtual_table_mode(self, True)
+        changed = render_virtual_window(self)
+    else:
+        set_virtual_table_mode(self, False)
+        first_visible, _ = self.table.yview()
+        changed = sync_company_table(self.table, company_rows, self.company_table_cache)
+        self.table.yview_moveto(first_visible)
 
-    # 📏 Adjust column widths automatically
-    auto_resize_columns(self.table, self.style)
+    if not company_rows:
+        return  # ⛔ No XML loaded yet → nothing to show
+
+    # 📏 Adjust column widths: everything on first load, then only new/changed rows
+    if not self.column_width_tracker:
+        values_list = [company_table_values(row) for row in company_rows]
+    else:
+        values_list = [self.company_table_cache[iid][0] for iid in changed if iid in self.company_table_cache]
+    if values_list or not self.column_width_tracker:
+        auto_resize_columns(self.table, self.style, values_list, self.column_width_tracker)
 
 def populate_company_tableview(self, company_rows=None):
     """Repopulate secondary Tableview from XML with ID, Name, and selected extra rows."""
@@ -162,6 +239,8 @@ def populate_company_tableview(self, company_rows=None):
     self.secondary_tableview.build_table_data(coldata=coldata, rowdata=rowdata)
     self.secondary_tableview.load_table_data(clear_filters=True)
     apply_tableview_row_colors(self)
+    self.tableview_rows_by_id = {str(tablerow.values[0]): tablerow for tablerow in self.secondary_tableview.tablerows}
+    self.tableview_stale = False
 
     # Reuse Treeview sorter for numeric ID sorting in secondary Tableview.
     view = self.secondary_tableview.view
@@ -203,7 +282,7 @@ def get_company_by_id(self, company_id):
     """Find a Company node by ID from xml_root."""
     if not hasattr(self, "xml_root") or self.xml_root is None:
         return None
-    return self.xml_root.find(f"Company[@ID='{company_id}']")
+    return find_company(self.xml_root, company_id, getattr(self, "company_index", None))
 
 def save_tableview_edits(self):
     """
@@ -216,10 +295,13 @@ def save_tableview_edits(self):
 
     company_map = getattr(self, "company_map", {}) or {}
     city_map = getattr(self, "city_map", {}) or {}
+    company_map_rev = get_reverse_map(self, "company_map")
+    city_map_rev = get_reverse_map(self, "city_map")
 
     applied = 0
     errors = []
     applied_keys = []
+    changed_fields = {}   # <Company> → field keys written
 
     for (company_id, field_key), display_value in list(pending.items()):
         company = get_company_by_id(self, company_id)
@@ -227,18 +309,25 @@ def save_tableview_edits(self):
             errors.append(f"Company ID {company_id} was not found.")
             continue
 
-        raw_value = parse_tableview_input(field_key, display_value, company_map, city_map)
-        ok, reason = write_company_field(company, field_key, raw_value)
+        raw_value = parse_tableview_input(
+            field_key, display_value, company_map, city_map, company_map_rev, city_map_rev
+        )
+        ok, reason = write_company_field(company, field_key, raw_value, getattr(self, "dirty_company_ids", None))
         if not ok:
             errors.append(f"{company_id}/{field_key}: {reason}")
             continue
 
+        changed_fields.setdefault(company, set()).add(field_key)
         applied += 1
         applied_keys.append((company_id, field_key))
 
     for key in applied_keys:
         pending.pop(key, None)
 
+    # 📣 One event per edited company; store, map and views catch up from there
+    for company, fields in changed_fields.items():
+        self.changes.publish(CompanyFieldsChanged(company, fields))
+
     return applied, errors
 
 def refresh_editor_ui(self):
@@ -248,26 +337,127 @@ def refresh_editor_ui(self):
     - Repopulates the company table.
     - Updates all dropdowns (company/city/etc.) with the latest values.
     """
+    with timed("refresh_editor_ui"):
+        _refresh_editor_ui(self)
 
+def _refresh_editor_ui(self):
     if not hasattr(self, "xml_root"):
-        print("⚠️ No Company XML loaded yet — skipping company table.")
+        logger.info("No Company XML loaded yet — skipping company table.")
 
-    # 🔄 Rebuild maps
-    if hasattr(self, "xml_root") and self.xml_root is not None:
-        self.company_map = load_company_map(self)  # from Company XML
-    else:
-        self.company_map = {}
+    # 🔄 company_map is patched by the edit paths; only a new XML root rebuilds it
+    with timed("load_company_map"):
+        ensure_company_map(self)
 
-    company_rows = build_company_rows(self)
+    refresh_company_views(self)
 
-    # 🖼️ Repopulate the company table (editable mode only)
+    # ⬇️ Refresh dropdown values (the value list only when its map changed)
+    with timed("dropdowns"):
+        refresh_detail_dropdowns(self)
+
+def refresh_company_views(self):
+    """Re-sync the company table and Tableview with the model (keyed: only changed rows touch Tk)."""
+    with timed("build_company_rows"):
+        company_rows = build_company_rows(self)
+
+    # 🖼️ Repopulate the company table (editable mode only, otherwise on the way back)
     if getattr(self, "table_available", True):
-        populate_company_table(self, company_rows)
+        with timed("populate_company_table"):
+            populate_company_table(self, company_rows)
+    else:
+        self.company_table_stale = True
+
+    with timed("populate_company_tableview"):
+        refresh_company_tableview(self, company_rows)
 
-    # Populate Tableview for mode switching consistency (also clears when xml is missing)
+    self.views_company_map_version = getattr(self, "company_map_version", 0)
+
+def refresh_company_tableview(self, company_rows=None):
+    """Repopulate the Tableview now if it's showing, otherwise on the next switch to it."""
+    if getattr(self, "editor_mode", "table") != "tableview":
+        self.tableview_stale = True
+        return
     populate_company_tableview(self, company_rows)
 
-    # ⬇️ Refresh dropdown values dynamically
+def company_names_changed(self):
+    """True if company_map changed since the views last rendered (Owner labels may be stale)."""
+    return getattr(self, "views_company_map_version", None) != getattr(self, "company_map_version", 0)
+
+def company_views_show_fields(self, fields):
+    """False only if none of these fields is visible in the table or Tableview (None = unknown → True)."""
+    if fields is None:
+        return True
+    return company_rows_show_fields(fields, getattr(self, "tableview_selected_field_key", "Funds_OnHand"))
+
+def update_company_rows(self, companies):
+    """
+    A few companies changed in place → patch just their Treeview/Tableview rows.
+    Falls back to refresh_company_views when the row order may change (sorted
+    table) or a row can't be matched (duplicate IDs, cache out of step).
+    """
+    if getattr(self, "table_sort", None):
+        refresh_company_views(self)
+        return
+
+    store = get_company_store(self)
+    rows = []
+    for company in companies:
+        if store.row_for_id(company.get("ID", "")) != store.row_of.get(company):
+            refresh_company_views(self)
+            return
+        row = refresh_company_row(self, company)
+        if row is None:
+            refresh_company_views(self)
+            return
+        rows.append(row)
+
+    if getattr(self, "table_available", True):
+        with timed("patch company table"):
+            patch_company_table_rows(self, rows)
+    else:
+        self.company_table_stale = True
+
+    if getattr(self, "editor_mode", "table") == "tableview":
+        with timed("patch company tableview"):
+            patch_company_tableview_rows(self, rows)
+    else:
+        self.tableview_stale = True
+
+def patch_company_table_rows(self, rows):
+    """Update the Treeview items of these rows (rows outside the virtual window are skipped)."""
+    if not hasattr(self, "table") or self.table is None:
+        return
+    table_cache = getattr(self, "company_table_cache", {})
+    changed_values = []
+    for row in rows:
+        cached = table_cache.get(row.id)
+        if cached is None or not self.table.exists(row.id):
+            continue   # not rendered right now; render_virtual_window picks it up from table_rows
+        if cached[0] != row.values:
+            self.table.item(row.id, values=row.values)
+            table_cache[row.id] = (row.values, cached[1])
+            changed_values.append(row.values)
+
+    if changed_values:
+        auto_resize_columns(self.table, self.style, changed_values, self.column_width_tracker)
+
+def patch_company_tableview_rows(self, rows):
+    """Update the Tableview rows of these companies; unknown rows → full repopulate."""
+    rows_by_id = getattr(self, "tableview_rows_by_id", None)
+    selected_key = getattr(self, "tableview_selected_field_key", "Funds_OnHand")
+    if rows_by_id is None or getattr(self, "tableview_stale", False):
+        populate_company_tableview(self)
+        return
+
+    for values in build_tableview_rows(self, rows, selected_key):
+        tablerow = rows_by_id.get(str(values[0]))
+        if tablerow is None:
+            populate_company_tableview(self)
+            return
+        if list(tablerow.values) != list(values):
+            tablerow.values = list(values)
+
+def refresh_detail_dropdowns(self, sources=None):
+    """Push map changes into the detail dropdowns (sources: only the ones fed by these maps)."""
     for key, widget in self.detail_labels.items():
         if isinstance(widget, ttk.Combobox) and key.endswith("_dropdown"):
             # Find the base key before "_dropdown"
@@ -276,10 +466,12 @@ def refresh_editor_ui(self):
 
             # Look up which map to use (default → company_map)
             dropdown_source = field_cfg.get("dropdown_map", "company_map")
+            if sources is not None and dropdown_source not in sources:
+                continue
             map_dict = getattr(self, dropdown_source, {}) or {}
 
             # Update dropdown values with latest map values
-            widget["values"] = list(map_dict.values())
+            sync_dropdown_values(self, base_key, widget, dropdown_source)
 
             # If the current var is set to a valid ID, sync it
             var = self.detail_vars.get(base_key)
@@ -371,46 +563,123 @@ def create_spinbox_with_optional_dropdown(editor, subframe, key, var, field_cfg,
 def get_dropdown_map(editor, dropdown_source):
     return getattr(editor, dropdown_source, {}) or {}
 
-def set_spinbox_from_dropdown(var, dropdown_var, map_dict, key):
+def get_reverse_map(editor, dropdown_source):
+    """{label: ID} kept next to the forward map (e.g. company_map_rev), or None if missing."""
+    return getattr(editor, f"{dropdown_source}_rev", None)
+
+def set_spinbox_from_dropdown(var, dropdown_var, map_dict, key, reverse_map=None):
     """Dropdown -> Spinbox (name -> ID)."""
     name = dropdown_var.get()
-    print(f"[DEBUG] on_dropdown_change: key={key} selected_name={name!r} map_size={len(map_dict)}")
-    for cid, cname in map_dict.items():
-        if cname == name:
-            print(f"[DEBUG] on_dropdown_change: match found {cid} -> {cname!r}")
-            var.set(str(cid))
-            return
-    print(f"[DEBUG] on_dropdown_change: no match for {name!r}")
+    logger.debug("on_dropdown_change: key=%s selected_name=%r map_size=%d", key, name, len(map_dict))
+    cid = lookup_label_id(name, map_dict, reverse_map)
+    if cid is not None:
+        logger.debug("on_dropdown_change: match found %s -> %r", cid, name)
+        var.set(str(cid))
+        return
+    logger.debug("on_dropdown_change: no match for %r", name)
 
 def set_dropdown_from_spinbox(var, dropdown_var, map_dict, key):
     """Spinbox -> Dropdown (ID -> label)."""
     raw = var.get()
-    print(f"[DEBUG] on_spinbox_change: key={key} raw_var={raw!r} map_size={len(map_dict)}")
+    logger.debug("on_spinbox_change: key=%s raw_var=%r map_size=%d", key, raw, len(map_dict))
     try:
         cid = int(raw)
         cname = map_dict.get(cid, "")
         if cname:
-            print(f"[DEBUG] on_spinbox_change: found {cid} -> {cname!r}; setting dropdown_var")
+            logger.debug("on_spinbox_change: found %s -> %r; setting dropdown_var", cid, cname)
             dropdown_var.set(cname)
         else:
-            print(f"[DEBUG] on_spinbox_change: id {cid} not in map -> clearing dropdown_var")
+            logger.debug("on_spinbox_change: id %s not in map -> clearing dropdown_var", cid)
             dropdown_var.set("")
     except Exception:
-        print(f"[DEBUG] on_spinbox_change: cannot parse {raw!r} -> clearing dropdown_var")
+        logger.debug("on_spinbox_change: cannot parse %r -> clearing dropdown_var", raw)
         dropdown_var.set("")
 
 def refresh_dropdown_widget_values(dropdown, map_dict, key):
     vals = list(map_dict.values())
     dropdown.configure(values=vals)
-    print(f"[DEBUG] refresh_dropdown_values: key={key} refreshed values (count={len(vals)})")
-
-def filter_dropdown_values(dropdown_var, map_dict):
+    logger.debug("refresh_dropdown_values: key=%s refreshed values (count=%d)", key, len(vals))
+
+def sync_dropdown_values(editor, key, dropdown, dropdown_source):
+    """Give the dropdown the full label list, unless it already shows this version of the map."""
+    shown_versions = getattr(editor, "dropdown_map_versions", None)
+    if shown_versions is None:
+        shown_versions = editor.dropdown_map_versions = {}
+    map_dict, version = map_version(editor, dropdown_source)
+    shown = shown_versions.get(key)
+    if shown is not None and shown[0] is map_dict and shown[1] == version:
+        return False
+    refresh_dropdown_widget_values(dropdown, map_dict or {}, key)
+    shown_versions[key] = (map_dict, version)
+    getattr(editor, "dropdown_filters", {}).pop(key, None)   # full list again
+    return True
+
+def filter_dropdown_values(dropdown_var, map_dict, search_index=None):
+    """(query, matching labels). With a LabelSearchIndex the result is capped."""
     value = dropdown_var.get().lower()
+    if search_index is not None:
+        return value, search_index.search(value)
     all_names = list(map_dict.values())
     if not value:
         return value, all_names
     return value, [name for name in all_names if value in name.lower()]
 
+def apply_dropdown_filter_values(editor, key, dropdown, dropdown_source, dropdown_var):
+    """Show the (capped) matches for the typed text and remember which query/map they are for."""
+    map_dict, version = map_version(editor, dropdown_source)
+    search_index = get_label_search_index(editor, dropdown_source)
+    value, filtered = filter_dropdown_values(dropdown_var, get_dropdown_map(editor, dropdown_source), search_index)
+    dropdown.configure(values=filtered)
+    getattr(editor, "dropdown_map_versions", {}).pop(key, None)   # showing a filtered list now
+    if not hasattr(editor, "dropdown_filters"):
+        editor.dropdown_filters = {}
+    editor.dropdown_filters[key] = (map_dict, version, value)
+    return value, filtered
+
+def show_dropdown_values(editor, key, dropdown, dropdown_source, dropdown_var):
+    """
+    Click/focus on a dropdown: the full label list only while the entry is empty.
+    With text in the entry keep (or re-apply, if the map changed) the capped search.
+    """
+    query = dropdown_var.get().strip()
+    if not query:
+        return sync_dropdown_values(editor, key, dropdown, dropdown_source)
+    map_dict, version = map_version(editor, dropdown_source)
+    shown = getattr(editor, "dropdown_filters", {}).get(key)
+    if shown is not None and shown[0] is map_dict and shown[1] == version and shown[2] == dropdown_var.get().lower():
+        return False
+    apply_dropdown_filter_values(editor, key, dropdown, dropdown_source, dropdown_var)
+    return True
+
+@contextmanager
+def suspend_detail_traces(editor):
+    """Spinbox → dropdown traces do nothing inside this block (see load_company_into_panel)."""
+    previous = getattr(editor, "detail_traces_suspended", False)
+    editor.detail_traces_suspended = True
+    try:
+        yield
+    finally:
+        editor.detail_traces_suspended = previous
+
+def resync_detail_dropdowns(editor):
+    """Run every spinbox → dropdown sync once (one map lookup per HQ/Owner field)."""
+    for sync in getattr(editor, "detail_dropdown_syncs", {}).values():
+        sync()
+
+def load_company_into_panel(editor, details):
+    """
+    Bulk-assign a company's {field key: raw value} to the detail vars.
+    Traces are suspended while assigning, then the dropdowns are resynced once.
+    """
+    detail_vars = editor.detail_vars
+    field_types = editor.field_types
+    with suspend_detail_traces(editor):
+        for key, val in details.items():
+            var = detail_vars.get(key)
+            if var is not None:
+                var.set(prepare_main_value(key, val, field_types))
+    resync_detail_dropdowns(editor)
+
 def bind_spinbox_dropdown_sync(editor, var, dropdown_var, dropdown, dropdown_source, key):
     """
     Keep spinbox 'var' and combobox 'dropdown_var' in sync.
@@ -420,29 +689,41 @@ def bind_spinbox_dropdown_sync(editor, var, dropdown_var, dropdown, dropdown_sou
 
     def on_dropdown_change(event=None):
         map_dict = get_dropdown_map(editor, dropdown_source)
-        set_spinbox_from_dropdown(var, dropdown_var, map_dict, key)
+        set_spinbox_from_dropdown(var, dropdown_var, map_dict, key, get_reverse_map(editor, dropdown_source))
 
     def on_spinbox_change(*args):
+        if getattr(editor, "detail_traces_suspended", False):
+            return
         map_dict = get_dropdown_map(editor, dropdown_source)
         set_dropdown_from_spinbox(var, dropdown_var, map_dict, key)
 
     def refresh_dropdown_values(event=None):
-        map_dict = get_dropdown_map(editor, dropdown_source)
-        refresh_dropdown_widget_values(dropdown, map_dict, key)
+        show_dropdown_values(editor, key, dropdown, dropdown_source, dropdown_var)
+
+    pending_filter = {"after_id": None}
+
+    def apply_dropdown_filter():
+        pending_filter["after_id"] = None
+        value, filtered = apply_dropdown_filter_values(editor, key, dropdown, dropdown_source, dropdown_var)
+        logger.debug("on_dropdown_keyrelease: filter=%r matches=%d", value, len(filtered))
+        return value
 
     def on_dropdown_keyrelease(event):
-        """Filter dropdown values dynamically, open list only when pressing Enter."""
-        map_dict = get_dropdown_map(editor, dropdown_source)
-        value, filtered = filter_dropdown_values(dropdown_var, map_dict)
-        dropdown.configure(values=filtered)
+        """Filter dropdown values once typing pauses, open list only when pressing Enter."""
+        # ⏱️ Debounce: every keystroke restarts the timer
+        if pending_filter["after_id"] is not None:
+            dropdown.after_cancel(pending_filter["after_id"])
+            pending_filter["after_id"] = None
 
-        # Only open dropdown when Enter is pressed
+        # Only open dropdown when Enter is pressed (filter right away)
         if event.keysym == "Return":
+            value = apply_dropdown_filter()
             dropdown.event_generate("<Down>")
             # keep cursor focused in entry so user can still type or press down arrow again
             dropdown.after(0, lambda: (dropdown.focus_set(), dropdown.icursor(len(value))))
+            return
 
-        print(f"[DEBUG] on_dropdown_keyrelease: key={event.keysym} filter='{value}' matches={len(filtered)}")
+        pending_filter["after_id"] = dropdown.after(DROPDOWN_SEARCH_DELAY_MS, apply_dropdown_filter)
 
     # Bind handlers
     dropdown.bind("<<ComboboxSelected>>", on_dropdown_change)
@@ -452,3 +733,8 @@ def bind_spinbox_dropdown_sync(editor, var, dropdown_var, dropdown, dropdown_sou
 
     # trace_add expects a callback that accepts (name, index, op) — use *args
     var.trace_add("write", on_spinbox_change)
+
+    # 🔁 Bulk panel loads skip the trace and call this once afterwards
+    if not hasattr(editor, "detail_dropdown_syncs"):
+        editor.detail_dropdown_syncs = {}
+    editor.detail_dropdown_syncs[key] = on_spinbox_change
@@ -0,0 +1,261 @@
+# import from different files
+from AIEditor.settings.config import VIRTUAL_TABLE_THRESHOLD, VIRTUAL_TABLE_BUFFER
+from AIEditor.logic.company_table_utils import sync_company_table
+
+DEFAULT_ROW_HEIGHT = 25
+WHEEL_STEP = 3
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+# 📋 Table model (shared by normal and virtual mode)
+def set_table_rows(self, company_rows):
+    """Remember the full, ordered company rows behind the company table."""
+    self.table_rows = company_rows
+    positions = {}
+    for idx, row in enumerate(company_rows):
+        positions.setdefault(row.id, idx)
+    self.table_row_positions = positions
+
+def get_table_company_ids(self):
+    """Company IDs in table order, including rows outside the virtual window."""
+    return [row.id for row in getattr(self, "table_rows", [])]
+
+def get_table_row_index(self, company_id):
+    return getattr(self, "table_row_positions", {}).get(str(company_id))
+
+def get_selected_table_company_id(self):
+    """ID of the selected company, even if its row is scrolled out of the virtual window."""
+    sel = self.table.selection()
+    if sel:
+        values = self.table.item(sel[0])["values"]
+        return str(values[0]) if values else None
+    if is_virtual_table(self):
+        return getattr(self, "selected_company_id", None)
+    return None
+
+def company_id_of_iid(iid):
+    """Treeview iid → company ID (duplicate IDs get "<id>~<pos>" iids)."""
+    return str(iid).split("~", 1)[0]
+
+def get_selected_table_company_ids(self):
+    """
+    Every selected company ID in table order, including rows scrolled out of
+    the virtual window (kept in editor.selected_company_ids).
+    """
+    if is_virtual_table(self):
+        selected = getattr(self, "selected_company_ids", None) or set()
+    else:
+        selected = {company_id_of_iid(iid) for iid in self.table.selection()}
+    positioned = [(get_table_row_index(self, cid), cid) for cid in selected]
+    return [cid for pos, cid in sorted(p for p in positioned if p[0] is not None)]
+
+def remember_table_selection(self):
+    """
+    <<TreeviewSelect>> → update editor.selected_company_ids.
+    Rows outside the rendered window keep their state (scrolling deletes their
+    Treeview items, which must not deselect them); rendered rows follow Tk.
+    """
+    rendered = {company_id_of_iid(iid) for iid in getattr(self, "company_table_cache", {})}
+    visible_selected = {company_id_of_iid(iid) for iid in self.table.selection()}
+    previous = getattr(self, "selected_company_ids", None) or set()
+    self.selected_company_ids = (previous - rendered) | visible_selected
+    return self.selected_company_ids
+
+def reset_table_selection(self):
+    """New XML → forget every selected ID (they'd select unrelated rows of the new file)."""
+    self.selected_company_ids = set()
+    self.selected_company_id = None
+    self.table_select_anchor = None
+
+def remap_table_selection(self, mapping):
+    """After a reindex: {old ID: new ID} → renumber the remembered selection, drop deleted IDs."""
+    def remap(company_id):
+        try:
+            new_id = mapping.get(int(company_id))
+        except (TypeError, ValueError):
+            return None
+        return None if new_id is None else str(new_id)
+
+    selected = (remap(cid) for cid in getattr(self, "selected_company_ids", None) or ())
+    self.selected_company_ids = {cid for cid in selected if cid is not None}
+    self.selected_company_id = remap(getattr(self, "selected_company_id", None))
+    self.table_select_anchor = remap(getattr(self, "table_select_anchor", None))
+
+def select_table_company(self, company_id):
+    """Scroll the company into view and select its row (only that row). Returns False if unknown."""
+    iid = str(company_id)
+    if not ensure_table_row_visible(self, iid) or not self.table.exists(iid):
+        return False
+    self.selected_company_ids = {iid}
+    self.table_select_anchor = iid
+    self.table.selection_set(iid)
+    self.table.focus(iid)
+    self.table.see(iid)
+    return True
+
+def ensure_table_row_visible(self, company_id):
+    pos = get_table_row_index(self, company_id)
+    if pos is None:
+        return False
+    if not is_virtual_table(self):
+        return True
+
+    visible = virtual_visible_rows(self)
+    if pos < self.virtual_start:
+        self.virtual_start = pos
+    elif pos >= self.virtual_start + visible:
+        self.virtual_start = pos - visible + 1
+    else:
+        return True
+    render_virtual_window(self)
+    return True
+
+# 🪟 Virtual mode
+def use_virtual_table(company_rows):
+    return len(company_rows) > VIRTUAL_TABLE_THRESHOLD
+
+def is_virtual_table(self):
+    return getattr(self, "virtual_table_active", False)
+
+def set_virtual_table_mode(self, active):
+    """
+    Switch the Treeview between normal scrolling and a virtual window.
+    In virtual mode the scrollbar maps to the full row list instead of the Treeview.
+    """
+    if active == is_virtual_table(self):
+        return
+    self.virtual_table_active = active
+    self.virtual_start = 0
+
+    if active:
+        self.table.configure(yscrollcommand=lambda *args: None)
+        self.table_vsb.configure(command=lambda *args: scroll_virtual_table(self, *args))
+    else:
+        self.table.configure(yscrollcommand=self.table_vsb.set)
+        self.table_vsb.configure(command=self.table.yview)
+
+def virtual_visible_rows(self):
+    """How many rows fit in the Treeview right now (heading excluded)."""
+    try:
+        row_height = int(self.style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+    except (TypeError, ValueError):
+        row_height = DEFAULT_ROW_HEIGHT
+
+    height = self.table.winfo_height()
+    if height <= 1:
+        # not laid out yet → fall back to the configured height in rows
+        return max(1, int(self.table.cget("height") or 10))
+    return max(1, height // row_height - 1)
+
+def render_virtual_window(self):
+    """Show rows [virtual_start, virtual_start + visible + buffer) and sync the scrollbar."""
+    rows = getattr(self, "table_rows", [])
+    total = len(rows)
+    visible = virtual_visible_rows(self)
+
+    start = max(0, min(getattr(self, "virtual_start", 0), total - visible))
+    self.virtual_start = start
+
+    window = rows[start:start + visible + VIRTUAL_TABLE_BUFFER]
+    changed = sync_company_table(self.table, window, self.company_table_cache, start_index=start)
+    self.table.yview_moveto(0)
+
+    # 🔁 Selected rows came back into the window → select them again (details stay as they are)
+    selected_ids = getattr(self, "selected_company_ids", None)
+    if selected_ids:
+        current = set(self.table.selection())
+        restore = [iid for iid in self.table.get_children() if company_id_of_iid(iid) in selected_ids and iid not in current]
+        if restore:
+            self.table.selection_add(*restore)
+
+    if total:
+        self.table_vsb.set(start / total, min(1.0, (start + visible) / total))
+    else:
+        self.table_vsb.set(0.0, 1.0)
+
+    return changed
+
+def scroll_virtual_table(self, *args):
+    """Scrollbar command in virtual mode ("moveto f" / "scroll n units|pages")."""
+    if not args:
+        return
+    total = len(getattr(self, "table_rows", []))
+
+    if args[0] == "moveto":
+        start = int(float(args[1]) * total)
+    elif args[0] == "scroll":
+        step = virtual_visible_rows(self) if args[2].startswith("page") else 1
+        start = self.virtual_start + int(args[1]) * step
+    else:
+        return
+
+    if start != self.virtual_start:
+        self.virtual_start = start
+        render_virtual_window(self)
+
+def on_virtual_mousewheel(self, event):
+    if not is_virtual_table(self):
+        return None
+    if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+        scroll_virtual_table(self, "scroll", -WHEEL_STEP, "units")
+    else:
+        scroll_virtual_table(self, "scroll", WHEEL_STEP, "units")
+    return "break"
+
+def on_table_click(self, event):
+    """
+    Plain click on a row replaces the selection, including rows outside the virtual
+    window; plain and Ctrl clicks also set the anchor for Shift ranges.
+    """
+    iid = self.table.identify_row(event.y)
+    if not iid or event.state & SHIFT_MASK:
+        return None
+    self.table_select_anchor = company_id_of_iid(iid)
+    if not event.state & CONTROL_MASK:
+        self.selected_company_ids = set()
+    return None
+
+def on_virtual_shift_click(self, event):
+    """Shift-click range over the full row list, not just the rendered window."""
+    if not is_virtual_table(self):
+        return None
+    iid = self.table.identify_row(event.y)
+    anchor = getattr(self, "table_select_anchor", None) or getattr(self, "selected_company_id", None)
+    start = get_table_row_index(self, anchor) if anchor else None
+    end = get_table_row_index(self, company_id_of_iid(iid)) if iid else None
+    if start is None or end is None:
+        return None
+
+    low, high = sorted((start, end))
+    self.selected_company_ids = {row.id for row in self.table_rows[low:high + 1]}
+    visible = [child for child in self.table.get_children() if company_id_of_iid(child) in self.selected_company_ids]
+    self.table.selection_set(visible)
+    self.table.focus(iid)
+    return "break"
+
+def on_virtual_key(self, event):
+    """Arrow/Page keys walk the full row list, shifting the window as needed."""
+    if not is_virtual_table(self):
+        return None
+
+    rows = getattr(self, "table_rows", [])
+    if not rows:
+        return "break"
+
+    visible = virtual_visible_rows(self)
+    steps = {"Up": -1, "Down": 1, "Prior": -visible, "Next": visible}
+    if event.keysym not in steps:
+        return None
+
+    company_id = get_selected_table_company_id(self)
+    pos = get_table_row_index(self, company_id) if company_id else None
+    if pos is None:
+        pos = self.virtual_start - steps[event.keysym]
+
+    new_pos = max(0, min(len(rows) - 1, pos + steps[event.keysym]))
+    select_table_company(self, rows[new_pos].id)
+    return "break"
+
+def on_virtual_resize(self, event=None):
+    if is_virtual_table(self):
+        render_virtual_window(self)
@@ -0,0 +1,27 @@
+# import from packages
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Only needed by Analyze/Export, so they stay out of the startup path
+HEAVY_MODULES = ("numpy", "pandas", "openpyxl")
+
+
+def warm_heavy_imports(modules=HEAVY_MODULES):
+    """Import the heavy modules in a daemon thread so the first Analyze/Export doesn't wait."""
+    def worker():
+        for name in modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logger.debug("Warm-up skipped %s: %s", name, e)
+                continue
+            logger.debug("Warmed %s in %.0f ms", name, (time.perf_counter() - start) * 1000)
+
+    thread = threading.Thread(target=worker, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -1,29 +1,49 @@
+import logging
+import os
+import stat
+import tempfile
 import xml.etree.ElementTree as ET
-import pandas as pd
+from contextlib import contextmanager
+# numpy/pandas/openpyxl are imported inside the DataFrame/Excel helpers (see logic/warmup.py)
 
 from AIEditor.logic.CRUD import build_new_company
+from AIEditor.settings.config import FIELD_TYPES
+from AIEditor.logic.company_table_utils import build_reverse_map
+from AIEditor.logic.timing import timed
+from AIEditor.logic.company_store import (
+    CompanyStore,
+    MISSING_INT,
+    collect_company_columns,
+    column_kind,
+)
+
+logger = logging.getLogger(__name__)
 
 def has_xml(xml_root):
     return xml_root is not None
 
 # 📂 XML Load & Save
+class XMLLoadCancelled(Exception):
+    """Raised when a streaming XML load is cancelled before it finishes."""
+
+def validate_ai_root(root, companies):
+    """Minimal structure check for AI/Company XML. Raises ValueError if broken."""
+    if root is None:
+        raise ValueError("Empty XML file (no root element).")
+
+    if not companies:
+        raise ValueError("XML does not contain any <Company> elements.")
+
+    for comp in companies[:5]:  # spot check first few
+        if "ID" not in comp.attrib or "Name" not in comp.attrib:
+            raise ValueError("Company element missing required 'ID' or 'Name' attributes.")
+
 def load_xml_file(file_path):
     """Return parsed XML root or raise a friendly error."""
     try:
         tree = ET.parse(file_path)
         root = tree.getroot()
-        if root is None:
-            raise ValueError("Empty XML file (no root element).")
-
-        # --- Minimal structure check for AI/Company XML ---
-        companies = root.findall(".//Company")
-        if not companies:
-            raise ValueError("XML does not contain any <Company> elements.")
-
-        for comp in companies[:5]:  # spot check first few
-            if "ID" not in comp.attrib or "Name" not in comp.attrib:
-                raise ValueError("Company element missing required 'ID' or 'Name' attributes.")
-
+        validate_ai_root(root, root.findall(".//Company") if root is not None else [])
         return root
 
     except ET.ParseError as e:
@@ -33,16 +53,230 @@ def load_xml_file(file_path):
     except (FileNotFoundError, PermissionError, OSError) as e:
         raise e
 
+def stream_xml_file(file_path, progress_callback=None, cancel_event=None, report_every=500):
+    """
+    Parse an AI XML file incrementally with iterparse (safe to run in a worker thread).
+
+    - progress_callback(fraction) gets 0.0 → 1.0 based on bytes read so far.
+    - cancel_event (threading.Event) aborts the load with XMLLoadCancelled.
+    - Returns the same root (and raises the same errors) as load_xml_file.
+    """
+    total_bytes = os.path.getsize(file_path) or 1
+    root = None
+    companies = []
+
+    try:
+        with open(file_path, "rb") as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+
+                if elem.tag != "Company":
+                    continue
+
+                companies.append(elem)
+                if len(companies) % report_every:
+                    continue
+
+                if cancel_event is not None and cancel_event.is_set():
+                    raise XMLLoadCancelled(file_path)
+                if progress_callback is not None:
+                    progress_callback(min(f.tell() / total_bytes, 1.0))
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise XMLLoadCancelled(file_path)
+
+        validate_ai_root(root, companies)
+        if progress_callback is not None:
+            progress_callback(1.0)
+        return root
+
+    except ET.ParseError as e:
+        raise ET.ParseError(f"Malformed XML: {e}")
+
 def save_xml_to_file(xml_root, file_path):
-    """Save the given xml_root to a file. Raises exception if fails."""
-    indent_xml(xml_root)   # ⭐ make it pretty before writing
-    tree = ET.ElementTree(xml_root)
-    tree.write(file_path, encoding="utf-8", xml_declaration=True)
+    """
+    Save the given xml_root to a file. Raises exception if fails.
+    Output is byte-identical to indent_xml + ElementTree.write, but the tree is not modified.
+    The file is replaced atomically, so a crash mid-write leaves the old file intact.
+    """
+    # Same text mode ElementTree.write uses for encoding="utf-8"
+    with atomic_write(file_path, encoding="utf-8", errors="xmlcharrefreplace") as f:
+        f.write(XML_DECLARATION)
+        for chunk in iter_xml_chunks(xml_root):
+            f.write(chunk)
+
+@contextmanager
+def atomic_write(file_path, binary=False, **open_kwargs):
+    """
+    Write to a temp file next to file_path, fsync it, then rename it over file_path.
+    On any error the temp file is removed and file_path is left untouched.
+    """
+    target = os.path.abspath(file_path)
+    directory = os.path.dirname(target)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        copy_file_mode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def _default_file_mode():
+    # os.umask can only be read by setting it, so do it once at import (main thread)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+DEFAULT_FILE_MODE = _default_file_mode()
+
+def copy_file_mode(source, tmp_path):
+    """Give the temp file the permissions of the file it replaces (mkstemp uses 0600)."""
+    try:
+        mode = stat.S_IMODE(os.stat(source).st_mode)
+    except FileNotFoundError:
+        mode = DEFAULT_FILE_MODE
+    os.chmod(tmp_path, mode)
+
+# ✍️ Streaming XML writer
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+WRITE_CHUNK_PARTS = 16384   # string pieces buffered before each write
+
+def escape_xml_attrib(text):
+    """Same escaping as ElementTree for attribute values."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "\"" in text:
+        text = text.replace("\"", "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+def escape_xml_text(text):
+    """Same escaping as ElementTree for text and tails."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+def serialize_element(elem, level, tail, append):
+    """
+    Append the XML for elem as if indent_xml(root) had run first.
+    - level is the element depth (root = 0); tail is the already-indented tail to emit.
+    """
+    tag = elem.tag
+    if tag is ET.Comment:
+        append(f"<!--{elem.text}-->")
+    elif tag is ET.ProcessingInstruction:
+        append(f"<?{elem.text}?>")
+    else:
+        if tag[:1] == "{":
+            raise ValueError(f"Namespaced tags are not supported: {tag}")
+        append("<" + tag)
+        if elem.attrib:
+            append("".join([f' {k}="{escape_xml_attrib(v)}"' for k, v in elem.items()]))
+
+        count = len(elem)
+        text = elem.text
+        if count and (not text or not text.strip()):
+            text = "\n" + level * "\t" + "\t"
+
+        if text or count:
+            append(">")
+            if text:
+                append(escape_xml_text(text))
+            child_indent = "\n" + (level + 1) * "\t"
+            last_indent = "\n" + level * "\t"
+            for idx, child in enumerate(elem, start=1):
+                child_tail = child.tail
+                if not child_tail or not child_tail.strip():
+                    child_tail = last_indent if idx == count else child_indent
+                serialize_element(child, level + 1, child_tail, append)
+            append("</" + tag + ">")
+        else:
+            append(" />")
+
+    if tail:
+        append(escape_xml_text(tail))
+
+def iter_xml_chunks(xml_root):
+    """
+    Yield the tab-indented XML for xml_root (no declaration) in large string chunks.
+    Walks <AINode> children one by one so memory stays bounded by the chunk size.
+    """
+    parts = []
+    append = parts.append
+
+    tag = xml_root.tag
+    append("<" + tag)
+    if xml_root.attrib:
+        append("".join([f' {k}="{escape_xml_attrib(v)}"' for k, v in xml_root.items()]))
+
+    count = len(xml_root)
+    text = xml_root.text
+    if count and (not text or not text.strip()):
+        text = "\n\t"
+
+    if text or count:
+        append(">")
+        if text:
+            append(escape_xml_text(text))
+
+        for idx, child in enumerate(xml_root, start=1):
+            child_tail = child.tail
+            if not child_tail or not child_tail.strip():
+                child_tail = "\n" if idx == count else "\n\t"
+            serialize_element(child, 1, child_tail, append)
+
+            if len(parts) >= WRITE_CHUNK_PARTS:
+                yield "".join(parts)
+                parts.clear()
+
+        append("</" + tag + ">")
+    else:
+        append(" />")
+
+    if xml_root.tail:
+        append(escape_xml_text(xml_root.tail))
+    yield "".join(parts)
 
 def indent_xml(elem, level=0):
     """
     Pretty-print XML by adding indents and newlines recursively.
-    Modifies the element tree in place.
+    Modifies the element tree in place (legacy save path, kept for comparisons).
     """
     i = "\n" + level * "\t"   # tab-based indent
     if len(elem):
@@ -75,14 +309,15 @@ def build_city_map_from_xml(self):
     - Expects self.city_xml_root to be set (from upload_city_xml).
     - Reads <City><ID id="..."/><NAME name="..."/><COUNTRY nation="..."/>.
     - Keeps IDs as int when possible.
-    - Saves into self.city_map as {id: "Name, Country"}.
+    - Saves into self.city_map as {id: "Name, Country"} and self.city_map_rev as {label: id}.
     """
     # 🧹 Start fresh
     self.city_map = {}
+    self.city_map_rev = {}
 
     root = getattr(self, "city_xml_root", None)
     if root is None:
-        print("🚫 No City XML loaded yet")
+        logger.info("No City XML loaded yet")
         return
 
     # ➕ Loop through all City elements
@@ -92,7 +327,7 @@ def build_city_map_from_xml(self):
         country_elem = city.find("COUNTRY")
 
         if id_elem is None or name_elem is None or country_elem is None:
-            print("⚠️ Skipped one city (missing ID/NAME/COUNTRY)")
+            logger.warning("Skipped one city (missing ID/NAME/COUNTRY)")
             continue
 
         cid_raw = id_elem.get("id")
@@ -100,7 +335,7 @@ def build_city_map_from_xml(self):
         country = country_elem.get("nation")
 
         if cid_raw is None or cname is None or country is None:
-            print("⚠️ Skipped one city (broken attributes)")
+            logger.warning("Skipped one city (broken attributes)")
             continue
 
         # 🔢 Convert ID into int (if possible)
@@ -115,6 +350,9 @@ def build_city_map_from_xml(self):
         # Save to map
         self.city_map[cid] = label
 
+    # 🔁 Label → ID for dropdown/tableview parsing (first ID wins on duplicate labels)
+    self.city_map_rev = build_reverse_map(self.city_map)
+
 def load_city_xml(file_path):
     tree = ET.parse(file_path)
     cities = tree.findall(".//City")
@@ -122,49 +360,214 @@ def load_city_xml(file_path):
         raise ValueError("XML does not contain any <Cities> elements.")
     return tree.getroot()
 
-def numericCheck(col):
-    try:
-        return pd.to_numeric(col)
-    except Exception:
-        print(f"Skipped non-numeric column: {col.name}")
-        return col
-    
-def XMLtoDF(xml_root):
-    rows = []
-    for company in xml_root.findall("Company"):
-        row = {}
-        for key, value in company.attrib.items():
-            row[key] = value
-        for child in company:
-            for key, value in child.attrib.items():
-                row[f"{child.tag}_{key}"] = value
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-    df = df.apply(numericCheck)
-    return df
-
-def AnalyzeXML(xml_root):
-    df = XMLtoDF(xml_root)
-    pd.set_option("display.float_format", "{:.2f}".format)
-    print(df.describe().transpose())
-
-def ExportExcel(xml_root, file_path):
-    if not xml_root:
-        return
-    df = XMLtoDF(xml_root)
+# 📊 DataFrame helpers (columns come from the CompanyStore, see logic/company_store.py)
+def parse_numbers(values):
+    """float64 array from raw strings; NaN where empty/missing, None if any value is real text."""
+    import numpy as np
+    import pandas as pd
 
-    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Companies")
+    if None not in values and "" not in values:
+        try:
+            return np.asarray(values, dtype=np.float64)   # C-speed fast path for clean columns
+        except ValueError:
+            pass
+
+    raw = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = (raw.isna() | (raw == "")).to_numpy()
+    if (np.isnan(numbers) & ~missing).any():
+        return None
+    return numbers
+
+def typed_column(values, kind):
+    """Build one typed Series from raw strings (dtype decided by the schema kind)."""
+    import numpy as np
+    import pandas as pd
+
+    if kind == "text":
+        return pd.Series(values, dtype="string")
+
+    numbers = parse_numbers(values)
+    if numbers is None:
+        return pd.Series(values, dtype="string")   # real text in there → keep it as text
+    return typed_numbers(numbers, kind)
+
+def typed_numbers(numbers, kind):
+    """Typed Series from a float64 array (NaN = missing) for a numeric schema kind."""
+    import numpy as np
+    import pandas as pd
+
+    if kind == "float":
+        return pd.Series(numbers, dtype="float64")
+
+    present = numbers[~np.isnan(numbers)]
+    if (present % 1 != 0).any():
+        return pd.Series(numbers, dtype="float64")   # fractional values in an int field stay float
+
+    if len(present) == len(numbers):
+        series = pd.Series(numbers.astype(np.int64), dtype="int64")
+    else:
+        series = pd.Series(numbers, dtype="Float64").astype("Int64")
+    if kind == "category":
+        return series.astype("category")
+    return series
+
+def store_column_series(column):
+    """Typed Series straight from a StoreColumn's array (no string parsing)."""
+    import numpy as np
+    import pandas as pd
+
+    if not column.numeric:
+        return typed_column(column.values, column.kind)   # text / not in the schema
+    if column.invalid:
+        return pd.Series(column.texts(), dtype="string")   # real text in there → keep it as text
+
+    if column.is_float:
+        return typed_numbers(np.frombuffer(column.values, dtype=np.float64).copy(), column.kind)
+
+    ints = np.frombuffer(column.values, dtype=np.int64)
+    missing = ints == MISSING_INT
+    if missing.any():
+        return typed_numbers(np.where(missing, np.nan, ints.astype(np.float64)), column.kind)
+    series = pd.Series(ints.copy(), dtype="int64")
+    if column.kind == "category":
+        return series.astype("category")
+    return series
+
+def store_to_dataframe(store):
+    """Company DataFrame from a CompanyStore, one typed column per store column."""
+    import pandas as pd
+
+    data = {name: store_column_series(column) for name, column in store.columns.items()}
+    return pd.DataFrame(data, index=pd.RangeIndex(len(store)))
 
-        ws = writer.book.active
+def XMLtoDF(xml_root):
+    """Company DataFrame with dtypes taken from FIELD_TYPES (built through a CompanyStore)."""
+    return store_to_dataframe(CompanyStore.from_xml(xml_root))
 
-        for column_cells in ws.columns:
-            max_length = 0
-            column_letter = column_cells[0].column_letter
+def AnalyzeXML(xml_root, store=None):
+    """Print describe() for every company column (store: the editor's CompanyStore, skips the XML walk)."""
+    import pandas as pd
 
-            for cell in column_cells:
-                if cell.value is not None:
-                    max_length = max(max_length, len(str(cell.value)))
+    with timed("XMLtoDF"):
+        df = store_to_dataframe(store) if store is not None else XMLtoDF(xml_root)
+    with timed("describe"):
+        pd.set_option("display.float_format", "{:.2f}".format)
+        print(df.describe().transpose())
 
-            ws.column_dimensions[column_letter].width = max_length + 2
\ No newline at end of file
+def ExportExcel(xml_root, file_path, store=None):
+    """
+    Export companies to an .xlsx sheet, streamed row by row from the CompanyStore
+    through openpyxl's write-only workbook (no DataFrame, bounded memory).
+    """
+    if not xml_root:
+        return
+    if store is None:
+        with timed("company store"):
+            store = CompanyStore.from_xml(xml_root)
+
+    with timed("write xlsx"):
+        export_excel_from_store(store, file_path)
+
+def excel_cell_getter(column):
+    """row → Excel value for one store column, with the dtypes XMLtoDF would give (missing → None)."""
+    values = column.values
+
+    if not column.numeric:
+        numeric, whole = column.text_numbers()
+        if not numeric:
+            return values.__getitem__
+
+        def text_number(row):
+            text = values[row]
+            if text is None or text == "":
+                return None
+            number = float(text)
+            return int(number) if whole else number
+        return text_number
+
+    if column.invalid:
+        return column.get   # real text in a numeric field → the whole column is text
+
+    if not column.is_float:
+        return lambda row: None if values[row] == MISSING_INT else values[row]
+
+    if excel_floats_as_int(column):
+        return lambda row: None if values[row] != values[row] else int(values[row])
+    return lambda row: None if values[row] != values[row] else values[row]
+
+def excel_floats_as_int(column):
+    """int fields promoted to floats still export as ints when every value is whole."""
+    import numpy as np
+
+    if column.kind == "float":
+        return False
+    floats = np.frombuffer(column.values, dtype=np.float64)
+    floats = floats[~np.isnan(floats)]
+    return bool(np.all(floats == np.floor(floats)))
+
+def excel_number_width(column):
+    """Longest printed number of a numeric column, from the typed array (min/max or str_len)."""
+    import numpy as np
+
+    if column.is_float:
+        floats = np.frombuffer(column.values, dtype=np.float64)
+        floats = floats[~np.isnan(floats)]
+        if not len(floats):
+            return 0
+        if not excel_floats_as_int(column):
+            # format each distinct value once (ratings etc. repeat a handful of values)
+            return int(np.char.str_len(np.unique(floats).astype(str)).max())
+        numbers = floats.astype(np.int64)
+    else:
+        numbers = np.frombuffer(column.values, dtype=np.int64)
+        numbers = numbers[numbers != MISSING_INT]
+        if not len(numbers):
+            return 0
+    # for integers the widest text is at one of the two ends
+    return max(len(str(numbers.min())), len(str(numbers.max())))
+
+def excel_column_width(name, column):
+    """Longest text (header included) + 2, from the column's arrays rather than per cell."""
+    longest = len(str(name))
+    if not column.numeric:
+        longest = max(longest, max(map(len, filter(None, column.values)), default=0))
+    else:
+        longest = max(longest, excel_number_width(column))
+        if column.invalid:   # exported as text: the original strings count too
+            longest = max(longest, max(map(len, filter(None, column.raw or ())), default=0))
+    return longest + 2
+
+def export_excel_from_store(store, file_path):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Companies")
+
+    names = list(store.columns)
+    getters = [excel_cell_getter(store.columns[name]) for name in names]
+    row_count = len(store)
+
+    # write-only sheets need their column widths before the first row
+    for idx, name in enumerate(names, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = excel_column_width(name, store.columns[name])
+
+    # Same header look as DataFrame.to_excel
+    thin = Side(style="thin")
+    header = []
+    for name in names:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal="center", vertical="top")
+        header.append(cell)
+    ws.append(header)
+
+    # 🌊 One row at a time straight from the columns
+    for row in range(row_count):
+        ws.append([getter(row) for getter in getters])
+
+    wb.save(file_path)
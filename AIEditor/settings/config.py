@@ -16,6 +16,41 @@ max_widths = {
     "Death": 60      # cap Death
 }
 
+# Big AI files: above this many companies the table only renders a window of rows
+VIRTUAL_TABLE_THRESHOLD = 5000
+VIRTUAL_TABLE_BUFFER = 20   # extra rows rendered below the viewport
+
+# Column auto-sizing: above this many rows only the longest strings get measured
+COLUMN_SAMPLE_THRESHOLD = 2000
+COLUMN_SAMPLE_SIZE = 50
+MEASURE_CACHE_SIZE = 20000   # memoized text widths kept before the cache starts over
+
+# HQ/Owner combobox search: max suggestions shown and keystroke debounce (ms)
+DROPDOWN_SEARCH_LIMIT = 200
+DROPDOWN_SEARCH_DELAY_MS = 120
+
+# Company details panel: sections are built once the window is up (or when expanded);
+# sections listed here start collapsed and are only built when the user opens them
+LAZY_DETAIL_SECTIONS = True
+DETAIL_SECTIONS_COLLAPSED = ()
+
+# Warm numpy/pandas/openpyxl in a background thread this long after startup (None = off)
+IMPORT_WARMUP_DELAY_MS = 1500
+
+# Background jobs (load/save/export/City XML/analyze): worker threads and result polling
+TASK_WORKERS = 2
+TASK_POLL_MS = 50
+
+# Operation timings shown in the status bar (set TIMING_LOG_PATH to also append JSON lines)
+TIMING_ENABLED = True
+TIMING_LOG_PATH = None   # e.g. "aieditor_timings.jsonl"
+
+# Logging: overall level plus per-module overrides, e.g. {"AIEditor.logic.ui_utils": "DEBUG"}
+# (AIEDITOR_LOG_LEVEL / AIEDITOR_LOG_LEVELS="ui_utils=DEBUG,preset_utils=DEBUG" override these)
+LOG_LEVEL = "WARNING"
+LOG_LEVELS = {}
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
 FIELD_LAYOUT = {
     "Identity": [
         ("single", [("Company_ID", "ID")]),
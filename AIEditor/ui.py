@@ -1,10 +1,19 @@
 # import from packages
+import logging
 import ttkbootstrap as ttk
 from ttkbootstrap.scrolled import ScrolledFrame
 from ttkbootstrap.tableview import Tableview
 
 #import from different files
-from AIEditor.settings.config import column_widths, FIELD_TYPES, FIELD_LAYOUT, GENERIC_MAP, CREDIT_MAP
+from AIEditor.settings.config import (
+    column_widths,
+    FIELD_TYPES,
+    FIELD_LAYOUT,
+    GENERIC_MAP,
+    CREDIT_MAP,
+    LAZY_DETAIL_SECTIONS,
+    DETAIL_SECTIONS_COLLAPSED,
+)
 from style import (
     SPACING,
     InitialWidth,
@@ -12,18 +21,30 @@ from style import (
     TABLEVIEW_ROW_HEIGHT,
 )
 from AIEditor.logic.preset_utils import PRESET_CONFIG
+from AIEditor.logic.CRUD import get_company_details
 from AIEditor.logic.tableview_editing import (
     cancel_tableview_cell_edit,
     start_tableview_cell_edit,
 )
+from AIEditor.logic.company_table_utils import COMPANY_TABLE_COLUMNS
+from AIEditor.logic.virtual_table import (
+    on_virtual_mousewheel,
+    on_virtual_key,
+    on_virtual_resize,
+    on_table_click,
+    on_virtual_shift_click,
+)
 from AIEditor.logic.ui_utils import (
     compute_entry_widths,
     create_widget,
-    sort_by_column,
+    sort_company_table,
     build_tableview_column_options,
     populate_company_tableview,
+    load_company_into_panel,
 )
 
+logger = logging.getLogger(__name__)
+
 def CreateButtons(self, main_frame):
     btn_frame = ttk.Frame(main_frame)
     btn_frame.grid(row=0, column=0, padx=SPACING["sm"], pady=SPACING["sm"])
@@ -53,14 +74,47 @@ def ActivateButton(self):
     self.generic_ai_btn.config(state="normal")
     self.switch_mode_btn.config(state="normal")
 
+def CreateProgressBar(self, main_frame):
+    """Progress row for long-running jobs (hidden until a job starts)."""
+    progress_frame = ttk.Frame(main_frame)
+    progress_frame.grid(row=2, column=0, sticky="ew", padx=SPACING["md"], pady=(0, SPACING["sm"]))
+    progress_frame.columnconfigure(1, weight=1)
+    self.progress_frame = progress_frame
+
+    self.progress_label = ttk.Label(progress_frame, text="")
+    self.progress_label.grid(row=0, column=0, sticky="w", padx=(0, SPACING["sm"]))
+
+    self.progress_var = ttk.DoubleVar(value=0)
+    self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100)
+    self.progress_bar.grid(row=0, column=1, sticky="ew")
+
+    self.progress_cancel_btn = ttk.Button(progress_frame, text="Cancel", bootstyle="secondary")
+    self.progress_cancel_btn.grid(row=0, column=2, padx=(SPACING["sm"], 0))
+
+    progress_frame.grid_remove()
+
+def CreateStatusBar(self, main_frame):
+    """One-line readout of the last timed operation (see logic/timing.py)."""
+    self.timing_status_var = ttk.StringVar(value="")
+    self.timing_status = ttk.Label(
+        main_frame,
+        textvariable=self.timing_status_var,
+        bootstyle="secondary",
+        anchor="w",
+    )
+    self.timing_status.grid(row=3, column=0, sticky="ew", padx=SPACING["md"], pady=(0, SPACING["sm"]))
+
 # Creating table
 def CreateTable(self, main_frame):
     table_frame = ttk.Frame(main_frame)
     table_frame.grid(row=0, column=0, sticky="nsew", padx=SPACING["md"], pady=SPACING["md"])
     self.table_container = table_frame
 
-    self.table = ttk.Treeview(table_frame)
-    self.table['columns'] = ("ID", "Name", "Owner", "HQ", "Founded", "Death", "Funds")
+    self.table = ttk.Treeview(table_frame, selectmode="extended")   # Ctrl/Shift-click → bulk delete
+    self.company_table_cache = {}
+    self.column_width_tracker = {}
+    self.table['columns'] = COMPANY_TABLE_COLUMNS
+    self.table_sort = None   # (column, reverse) once a heading is clicked
 
     self.table.heading("#0", text="", anchor="w")
     self.table.column("#0", width=0, stretch=False)
@@ -69,17 +123,28 @@ def CreateTable(self, main_frame):
         self.table.heading(
             col,
             text=col,
-            command=lambda _col=col: sort_by_column(self.table, _col, False)
+            command=lambda _col=col: sort_company_table(self, _col)
         )
         self.table.column(col, anchor="w", width=column_widths.get(col, 100))
 
     vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
     self.table.configure(yscrollcommand=vsb.set)
+    self.table_vsb = vsb
 
     self.table.pack(side="left", fill="both", expand=True)
     vsb.pack(side="right", fill="y")
 
     self.table.bind("<<TreeviewSelect>>", self.show_details)
+    # Multi-select that survives the virtual window (see remember_table_selection)
+    self.table.bind("<Button-1>", lambda e: on_table_click(self, e))
+    self.table.bind("<Shift-Button-1>", lambda e: on_virtual_shift_click(self, e))
+
+    # Virtual mode (huge files) handles scrolling/navigation itself
+    for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+        self.table.bind(sequence, lambda e: on_virtual_mousewheel(self, e))
+    for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>"):
+        self.table.bind(sequence, lambda e: on_virtual_key(self, e))
+    self.table.bind("<Configure>", lambda e: on_virtual_resize(self, e))
 
 def CreateSecondaryTableview(self, main_frame):
     tableview_frame = ttk.Frame(main_frame)
@@ -174,40 +239,104 @@ def CreateCompanyDetails(app, main_frame):
     app.detail_labels = {}
     app.detail_vars = {}
     app.field_types = {}
+    app.detail_sections = {}
+
+    for section in FIELD_LAYOUT:
+        CreateDetailSection(app, content_frame, section)
+
+    # 🐢 Only the first section is built now; the rest follow once the window is up
+    sections = list(FIELD_LAYOUT)
+    if not LAZY_DETAIL_SECTIONS:
+        for section in sections:
+            build_detail_section(app, section)
+    elif sections:
+        build_detail_section(app, sections[0])
+        app.after_idle(lambda: build_pending_detail_sections(app))
+    return detail_frame
 
-    frames = {
-        "Identity": ttk.LabelFrame(content_frame, text="Identity"),
-        "Funds": ttk.LabelFrame(content_frame, text="Funds"),
-        "Skills": ttk.LabelFrame(content_frame, text="Skills"),
-        "Design": ttk.LabelFrame(content_frame, text="Design"),
-        "Image": ttk.LabelFrame(content_frame, text="Image"),
-        "Behavior": ttk.LabelFrame(content_frame, text="Behavior"),
-        "Aggressions": ttk.LabelFrame(content_frame, text="Aggressions"),
+def CreateDetailSection(app, content_frame, section):
+    """Collapsible LabelFrame whose header toggles it; fields are built by build_detail_section."""
+    expanded = section not in DETAIL_SECTIONS_COLLAPSED
+    frame = ttk.LabelFrame(content_frame)
+    frame.pack(fill="x", padx=SPACING["s"], pady=SPACING["s"])
+
+    # Header is a child of the frame so it stacks above the border
+    header = ttk.Button(
+        frame,
+        text=section_header_text(section, expanded),
+        bootstyle="link",
+        command=lambda: toggle_detail_section(app, section),
+    )
+    frame.configure(labelwidget=header)
+
+    body = ttk.Frame(frame)
+    if expanded:
+        body.pack(fill="x")
+
+    app.detail_sections[section] = {
+        "frame": frame,
+        "body": body,
+        "header": header,
+        "expanded": expanded,
+        "built": False,
     }
 
-    for f in frames.values():
-        f.pack(fill="x", padx=SPACING["s"], pady=SPACING["s"])
-
-    for section, fields in FIELD_LAYOUT.items():
-        frame = frames[section]
-        for ftype, fdefs in fields:
-            if ftype == "single":
-                make_multi_entry(app, frame, [(fdefs[0][0], fdefs[0][1])])
-            elif ftype == "preset":
-                key, label = fdefs[0]
-                cfg = PRESET_CONFIG.get(key)
-                if cfg:
-                    make_preset_dropdown(
-                        app,
-                        frame,
-                        key,
-                        label,
-                        cfg["dict"],
-                        cfg["apply"],
-                    )
-            else:
-                make_multi_entry(app, frame, fdefs)
-    return detail_frame
+def section_header_text(section, expanded):
+    return f"{'▾' if expanded else '▸'} {section}"
+
+def toggle_detail_section(app, section):
+    state = app.detail_sections[section]
+    state["expanded"] = not state["expanded"]
+    state["header"].config(text=section_header_text(section, state["expanded"]))
+    if state["expanded"]:
+        build_detail_section(app, section)
+        state["body"].pack(fill="x")
+    else:
+        state["body"].pack_forget()
+
+def build_pending_detail_sections(app):
+    """Build the next expanded-but-empty section, one per idle pass so the UI stays responsive."""
+    for section, state in app.detail_sections.items():
+        if state["expanded"] and not state["built"]:
+            build_detail_section(app, section)
+            app.after_idle(lambda: build_pending_detail_sections(app))
+            return
+
+def build_detail_section(app, section):
+    """Create a section's widgets (once) and fill them with the selected company's values."""
+    state = app.detail_sections[section]
+    if state["built"]:
+        return
+    state["built"] = True
+
+    known_keys = set(app.detail_vars)
+    frame = state["body"]
+    for ftype, fdefs in FIELD_LAYOUT[section]:
+        if ftype == "single":
+            make_multi_entry(app, frame, [(fdefs[0][0], fdefs[0][1])])
+        elif ftype == "preset":
+            key, label = fdefs[0]
+            cfg = PRESET_CONFIG.get(key)
+            if cfg:
+                make_preset_dropdown(
+                    app,
+                    frame,
+                    key,
+                    label,
+                    cfg["dict"],
+                    cfg["apply"],
+                )
+        else:
+            make_multi_entry(app, frame, fdefs)
+
+    # 📥 A company is already on screen → show its values in the new fields too
+    company_id = getattr(app, "selected_company_id", None)
+    xml_root = getattr(app, "xml_root", None)
+    if company_id is None or xml_root is None:
+        return
+    details = get_company_details(xml_root, company_id, getattr(app, "company_index", None))
+    new_keys = set(app.detail_vars) - known_keys
+    load_company_into_panel(app, {key: val for key, val in details.items() if key in new_keys})
 
 def make_multi_entry(editor, frame, fields):
     row = ttk.Frame(frame)
@@ -280,15 +409,15 @@ def make_preset_dropdown(editor, frame, key, display_name, presets_dict, apply_f
     # --- Event binding ---
     def on_select(event=None):
         chosen = var.get()
-        print(f"[DEBUG] Preset selected: {chosen}")
+        logger.debug("Preset selected: %s", chosen)
 
         if key.lower().endswith("credit"):
             raw_value = CREDIT_MAP[chosen]   # map label back to number
-            print(f"[DEBUG] Credit '{chosen}' mapped to {raw_value}")
+            logger.debug("Credit %r mapped to %s", chosen, raw_value)
             apply_func(editor, raw_value)
         elif key.lower().endswith("genericdesigner"):
             raw_value = GENERIC_MAP[chosen]   # map label back to number
-            print(f"[DEBUG] Generic Designer '{chosen}' mapped to {raw_value}")
+            logger.debug("Generic Designer %r mapped to %s", chosen, raw_value)
             apply_func(editor, raw_value)
         else:
             apply_func(editor, chosen)
@@ -2,6 +2,7 @@ import ttkbootstrap as ttk
 
 from style import setup_styles, unbound
 from AIEditor.AIEditor import AIEditor
+from AIEditor.logic.log_setup import configure_logging
 
 class App:
     def __init__(self):
@@ -26,6 +27,9 @@ class App:
         # Apply external styles 🎨
         setup_styles(self)
 
+        # Stop background tasks before Tk goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def CreateMenuBar(self):
         menubar = ttk.Menu(self.root)
 
@@ -61,9 +65,14 @@ class App:
             self.style.theme_use("flatly")
             setup_styles(self)
 
+    def on_close(self):
+        self.editor.tasks.shutdown()
+        self.root.destroy()
+
     def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
+    configure_logging()
     app = App()
     app.run()
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Compare the streaming XML writer with the legacy indent_xml + ElementTree.write path.
+
+Run from the repository root:
+    python -m benchmarks.bench_save --companies 20000
+"""
+import argparse
+import copy
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from AIEditor.logic.xml_utils import save_xml_to_file, indent_xml
+from benchmarks.generate import generate_ai_root
+
+
+def legacy_save(xml_root, file_path):
+    indent_xml(xml_root)
+    ET.ElementTree(xml_root).write(file_path, encoding="utf-8", xml_declaration=True)
+
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--companies", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    root = generate_ai_root(args.companies, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.xml")
+        stream_path = os.path.join(tmp, "stream.xml")
+
+        # legacy path mutates the tree, so it gets its own copy
+        legacy_time = best_of(args.repeat, legacy_save, copy.deepcopy(root), legacy_path)
+        stream_time = best_of(args.repeat, save_xml_to_file, root, stream_path)
+
+        with open(legacy_path, "rb") as a, open(stream_path, "rb") as b:
+            identical = a.read() == b.read()
+        size_mb = os.path.getsize(stream_path) / (1024 * 1024)
+
+    print(f"companies:  {args.companies} ({size_mb:.1f} MB)")
+    print(f"legacy:     {legacy_time:.3f}s")
+    print(f"streaming:  {stream_time:.3f}s ({legacy_time / stream_time:.1f}x)")
+    print(f"identical:  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Time-to-first-window for the editor, with lazy vs eager company detail sections.
+Needs a display. On a headless machine it starts its own Xvfb through
+xvfbwrapper (pip install xvfbwrapper; needs the Xvfb binary), or run it under xvfb-run.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import contextlib
+import os
+import time
+import tkinter as tk
+
+import AIEditor.ui as ui
+from app import App
+
+
+def pump_until(root, done, timeout=30.0):
+    """Process Tk events until done() is true (or timeout)."""
+    deadline = time.perf_counter() + timeout
+    while not done() and time.perf_counter() < deadline:
+        root.update()
+
+
+def measure(lazy):
+    """(seconds to first drawn window, seconds until every expanded section exists)."""
+    ui.LAZY_DETAIL_SECTIONS = lazy
+
+    start = time.perf_counter()
+    app = App()
+    app.root.update()
+    first_window = time.perf_counter() - start
+
+    sections = app.editor.detail_sections
+    pump_until(app.root, lambda: all(s["built"] for s in sections.values() if s["expanded"]))
+    all_sections = time.perf_counter() - start
+
+    app.on_close()   # shuts the editor's task pool down, then destroys the root
+    return first_window, all_sections
+
+
+def virtual_display():
+    """Xvfb for the run when there is no DISPLAY and xvfbwrapper is installed; else a no-op."""
+    if os.environ.get("DISPLAY"):
+        return contextlib.nullcontext()
+    try:
+        from xvfbwrapper import Xvfb
+    except ImportError:
+        return contextlib.nullcontext()
+    return Xvfb(width=1400, height=800)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        try:
+            stack.enter_context(virtual_display())
+        except OSError as e:   # xvfbwrapper: Xvfb binary missing / failed to start
+            raise SystemExit(f"🚫 No display available: {e}")
+        run(args.repeat)
+
+
+def run(repeat):
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        raise SystemExit(f"🚫 No display available: {e}")
+
+    results = {}
+    for label, lazy in (("eager", False), ("lazy", True)):
+        runs = [measure(lazy) for _ in range(repeat)]
+        results[label] = (min(r[0] for r in runs), min(r[1] for r in runs))
+
+    for label, (first_window, all_sections) in results.items():
+        print(f"{label:<6} first window {first_window * 1000:7.1f} ms   all sections {all_sections * 1000:7.1f} ms")
+    eager, lazy = results["eager"][0], results["lazy"][0]
+    print(f"first window: {eager / lazy:.2f}x faster with lazy sections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Import-time regression check based on `python -X importtime`.
+
+Fails (exit code 1) if importing the app pulls in a module that should stay lazy
+(pandas, numpy, openpyxl) or if the app's own cumulative import time exceeds a budget.
+The lazy-import part also runs with the test suite (tests/test_import_time.py);
+this script adds the timing report and the budget.
+
+Run from the repository root:
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --module app --budget-ms 1500 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+FORBIDDEN = ("numpy", "pandas", "openpyxl")
+
+
+def run_importtime(module):
+    """{module name: (self µs, cumulative µs)} for a fresh interpreter importing `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"🚫 import {module} failed:\n{proc.stderr[-2000:]}")
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="max cumulative import time")
+    parser.add_argument("--top", type=int, default=10, help="print the N slowest modules")
+    args = parser.parse_args()
+
+    timings = run_importtime(args.module)
+    total_ms = timings.get(args.module, (0, 0))[1] / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms cumulative")
+    for name, (self_us, _) in sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    problems = []
+    eager = sorted({name.split(".")[0] for name in timings} & set(FORBIDDEN))
+    for package in eager:
+        problems.append(f"{package} is imported at startup")
+    if total_ms > args.budget_ms:
+        problems.append(f"cumulative import time {total_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ heavy modules stay lazy")
+
+
+if __name__ == "__main__":
+    main()
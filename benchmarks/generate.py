@@ -0,0 +1,110 @@
+"""
+Seeded generator for synthetic GearCity AI and City XML files.
+
+Run from the repository root:
+    python -m benchmarks.generate --scale 10k --out /tmp/gearcity
+"""
+import argparse
+import os
+import random
+import xml.etree.ElementTree as ET
+
+from AIEditor.settings.config import GENERIC_AI_TEMPLATE
+from AIEditor.logic.xml_utils import save_xml_to_file
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+}
+
+NAME_PARTS = ["Auto", "Motor", "Car", "Wagen", "Works", "Union", "General", "Star", "Crown", "Atlas"]
+COUNTRIES = ["USA", "Germany", "France", "Italy", "Japan", "UK", "Sweden", "Brazil", "India", "China"]
+RATING_FIELDS = ("Rating_", "Aggression", "ClusterSpace", "ExportDesigns", "ImportDesigns")
+
+
+def random_section_value(rng, section, attr):
+    """A plausible value for one GENERIC_AI_TEMPLATE attribute (-1 = random in game)."""
+    if rng.random() < 0.1:
+        return "-1"
+    if section == "Funds":
+        if attr == "OnHand":
+            return str(rng.randint(10_000, 50_000_000))
+        if attr == "Credit":
+            return str(rng.randint(0, 9))
+        return str(rng.randint(0, 5_000_000))
+    if section == "Behavior":
+        if attr == "GenericDesigner":
+            return str(rng.choice((-1, 0, 1)))
+        if any(token in attr for token in RATING_FIELDS):
+            return f"{rng.randint(0, 20) * 0.05:.2f}"
+    return str(rng.randint(0, 100))
+
+
+def generate_ai_root(count, seed=0, city_count=1000):
+    """<AINode> with `count` companies carrying every section from GENERIC_AI_TEMPLATE."""
+    rng = random.Random(seed)
+    root = ET.Element("AINode")
+
+    for cid in range(1, count + 1):
+        # ~20% are subsidiaries of an earlier company
+        owner = rng.randint(1, cid) if cid > 1 and rng.random() < 0.2 else cid
+        founded = rng.randint(1900, 1990)
+        company = ET.SubElement(root, "Company", {
+            "ID": str(cid),
+            "Name": f"{rng.choice(NAME_PARTS)} {rng.choice(NAME_PARTS)} {cid}",
+            "Active": "1" if owner == cid else "0",
+            "OwnerID": str(owner),
+            "HQ": str(rng.randint(1, city_count)),
+            "Founded": str(founded),
+            "Death": str(rng.randint(founded, 2100)),
+            "Logo": f"logo_{cid % 250}.dds",
+        })
+        for section, attributes in GENERIC_AI_TEMPLATE.items():
+            ET.SubElement(company, section, {
+                attr: random_section_value(rng, section, attr) for attr in attributes
+            })
+
+    return root
+
+
+def generate_city_root(count, seed=0):
+    """<Cities> with `count` <City><ID/><NAME/><COUNTRY/></City> entries."""
+    rng = random.Random(seed)
+    root = ET.Element("Cities")
+
+    for cid in range(1, count + 1):
+        city = ET.SubElement(root, "City")
+        ET.SubElement(city, "ID", {"id": str(cid)})
+        ET.SubElement(city, "NAME", {"name": f"{rng.choice(NAME_PARTS)}ville {cid}"})
+        ET.SubElement(city, "COUNTRY", {"nation": rng.choice(COUNTRIES)})
+
+    return root
+
+
+def write_dataset(out_dir, count, seed=0):
+    """Write ai_<count>.xml and city_<count>.xml into out_dir and return both paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    city_count = max(100, count // 10)
+    ai_path = os.path.join(out_dir, f"ai_{count}.xml")
+    city_path = os.path.join(out_dir, f"city_{count}.xml")
+
+    save_xml_to_file(generate_ai_root(count, seed, city_count), ai_path)
+    save_xml_to_file(generate_city_root(city_count, seed), city_path)
+    return ai_path, city_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=sorted(SCALES), action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark_data")
+    args = parser.parse_args()
+
+    for scale in args.scale or sorted(SCALES):
+        ai_path, city_path = write_dataset(args.out, SCALES[scale], args.seed)
+        print(f"{scale}: {ai_path}, {city_path}")
+
+
+if __name__ == "__main__":
+    main()
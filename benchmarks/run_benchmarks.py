@@ -0,0 +1,186 @@
+"""
+Time the editor's hot paths on seeded synthetic data and store the results as JSON.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --scale 1k --scale 10k --label my-branch
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/main.json
+
+Each result file looks like
+    {"label", "commit", "python", "timestamp", "results": {scale: {benchmark: seconds}}}
+and --compare flags any benchmark that got slower than --tolerance.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from benchmarks.generate import SCALES, write_dataset
+from AIEditor.logic.xml_utils import (
+    load_xml_file,
+    load_city_xml,
+    build_city_map_from_xml,
+    save_xml_to_file,
+    XMLtoDF,
+    store_to_dataframe,
+    ExportExcel,
+)
+from AIEditor.logic.CRUD import delete_company_and_reindex, delete_companies_and_reindex
+from AIEditor.logic.company_index import build_company_index
+from AIEditor.logic.company_store import CompanyStore
+from AIEditor.logic.company_table_utils import build_company_rows
+from AIEditor.logic.company_map import load_company_map
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SCALES = ("1k", "10k")
+
+
+def best_of(repeat, func, setup=None):
+    """Best wall time of `repeat` runs; setup() (untimed) builds the args for each run."""
+    best = None
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def editor_stub(xml_root, city_root):
+    """The few editor attributes the table/map helpers read."""
+    editor = SimpleNamespace(xml_root=xml_root, city_xml_root=city_root)
+    build_city_map_from_xml(editor)
+    editor.company_map = load_company_map(editor)
+    editor.company_store = CompanyStore.from_xml(xml_root)
+    return editor
+
+
+def run_scale(count, repeat, tmp_dir, skip=()):
+    ai_path, city_path = write_dataset(tmp_dir, count)
+    xml_root = load_xml_file(ai_path)
+    editor = editor_stub(xml_root, load_city_xml(city_path))
+    out_path = os.path.join(tmp_dir, "saved.xml")
+    middle_id = str(count // 2)
+    bulk_ids = [str(cid) for cid in range(1, count + 1, 100)]
+
+    benchmarks = {
+        "load_xml_file": lambda: best_of(repeat, load_xml_file, lambda: (ai_path,)),
+        "build_company_rows": lambda: best_of(repeat, build_company_rows, lambda: (cold_rows(editor),)),
+        "build_company_rows (cached)": lambda: best_of(repeat, build_company_rows, lambda: (editor,)),
+        "load_company_map": lambda: best_of(repeat, load_company_map, lambda: (editor,)),
+        "CompanyStore.from_xml": lambda: best_of(repeat, CompanyStore.from_xml, lambda: (xml_root,)),
+        "XMLtoDF": lambda: best_of(repeat, XMLtoDF, lambda: (xml_root,)),
+        "store_to_dataframe": lambda: best_of(repeat, store_to_dataframe, lambda: (editor.company_store,)),
+        "save_xml_to_file": lambda: best_of(repeat, save_xml_to_file, lambda: (xml_root, out_path)),
+        # deletion mutates the tree → every run gets a fresh copy and index
+        "delete_company_and_reindex": lambda: best_of(
+            repeat, delete_company_and_reindex, lambda: fresh_delete_args(xml_root, middle_id)
+        ),
+        # 1% of the companies in one call (single reindex pass)
+        "delete_companies_and_reindex": lambda: best_of(
+            repeat, delete_companies_and_reindex, lambda: fresh_delete_args(xml_root, bulk_ids)
+        ),
+        "ExportExcel": lambda: best_of(
+            repeat, ExportExcel, lambda: (xml_root, os.path.join(tmp_dir, "export.xlsx"))
+        ),
+    }
+
+    results = {}
+    for name, bench in benchmarks.items():
+        if name in skip:
+            continue
+        results[name] = round(bench(), 6)
+        print(f"  {name:<28} {results[name]:.4f}s", flush=True)
+    return results
+
+
+def cold_rows(editor):
+    """Drop the per-company row cache so build_company_rows builds every row."""
+    editor.company_row_cache = None
+    return editor
+
+
+def fresh_delete_args(xml_root, company_id):
+    root = copy.deepcopy(xml_root)
+    return root, company_id, build_company_index(root)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(baseline, current, tolerance):
+    """Print a per-benchmark ratio and return the list of regressions."""
+    regressions = []
+    for scale, benches in current["results"].items():
+        old_benches = baseline.get("results", {}).get(scale, {})
+        for name, seconds in benches.items():
+            old = old_benches.get(name)
+            if not old:
+                continue
+            ratio = seconds / old
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  ⚠️ slower"
+                regressions.append((scale, name, old, seconds))
+            print(f"  {scale:>5} {name:<28} {old:.4f}s → {seconds:.4f}s ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), action="append")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip", action="append", default=[], help="benchmark name to skip")
+    parser.add_argument("--label", default=None, help="result file name (default: commit hash)")
+    parser.add_argument("--out-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", default=None, help="baseline result JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "label": args.label or commit or "unlabelled",
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "results": {},
+    }
+
+    for scale in args.scale or DEFAULT_SCALES:
+        print(f"📏 {scale} companies")
+        with tempfile.TemporaryDirectory() as tmp:
+            report["results"][scale] = run_scale(SCALES[scale], args.repeat, tmp, set(args.skip))
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    out_path = os.path.join(args.out_dir, f"{report['label']}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {out_path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"📊 Compared with {baseline.get('label')} ({baseline.get('commit')})")
+        if compare_results(baseline, report, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# tests import the editor as AIEditor.logic..., same as app.py run from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
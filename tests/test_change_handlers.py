@@ -0,0 +1,45 @@
+"""
+CompanyFieldsChanged.fields lets the view handler skip the row patch when the
+edit touched nothing the table or Tableview shows.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from AIEditor.logic import change_handlers
+from AIEditor.logic.change_bus import ChangeBus, CompanyFieldsChanged
+from AIEditor.logic.ui_utils import company_views_show_fields
+
+
+def test_views_show_fields():
+    editor = SimpleNamespace(tableview_selected_field_key="Behavior_Aggression")
+
+    assert company_views_show_fields(editor, None)
+    assert company_views_show_fields(editor, {"Company_Name"})
+    assert company_views_show_fields(editor, {"Funds_OnHand"})
+    assert company_views_show_fields(editor, {"Behavior_Aggression"})
+    assert not company_views_show_fields(editor, {"Funds_Loans", "Company_Logo"})
+
+
+@pytest.fixture
+def patched_views(monkeypatch):
+    calls = []
+    monkeypatch.setattr(change_handlers, "company_names_changed", lambda editor: False)
+    monkeypatch.setattr(change_handlers, "update_company_rows", lambda editor, companies: calls.append(companies))
+    return calls
+
+
+@pytest.mark.parametrize("fields, patched", [
+    (None, True),                  # detail panel / generic AI: unknown → patch
+    ({"Funds_OnHand"}, True),      # Treeview column
+    ({"Funds_Loans"}, False),      # neither Treeview nor the Tableview column
+])
+def test_view_handler_uses_fields(patched_views, fields, patched):
+    editor = SimpleNamespace(tableview_selected_field_key="Company_Founded")
+    bus = ChangeBus()
+    change_handlers.subscribe_view_handlers(editor, bus)
+    company = object()
+
+    bus.publish(CompanyFieldsChanged(company, fields))
+
+    assert patched_views == ([[company]] if patched else [])
@@ -0,0 +1,87 @@
+"""
+The ID → <Company> index must match the XML after every structural change
+(load, add, single delete, bulk delete).
+"""
+import pytest
+
+from AIEditor.logic.company_index import build_company_index, check_company_index, find_company
+from AIEditor.logic.CRUD import build_new_company, delete_company_and_reindex, delete_companies_and_reindex
+from AIEditor.logic.xml_utils import load_xml_file
+from benchmarks.generate import generate_ai_root, write_dataset
+
+COMPANY_COUNT = 50
+
+
+@pytest.fixture
+def xml_root():
+    return generate_ai_root(COMPANY_COUNT, seed=1, city_count=100)
+
+
+@pytest.fixture
+def company_index(xml_root):
+    return build_company_index(xml_root)
+
+
+def company_ids(xml_root):
+    return [company.get("ID") for company in xml_root.findall("Company")]
+
+
+def assert_owner_ids_valid(xml_root):
+    ids = set(company_ids(xml_root))
+    for company in xml_root.findall("Company"):
+        owner = company.get("OwnerID")
+        assert owner in ids or owner in ("0", "", None), f"Company {company.get('ID')} owned by missing {owner}"
+
+
+def test_index_after_load(tmp_path):
+    ai_path, _ = write_dataset(str(tmp_path), COMPANY_COUNT, seed=1)
+    xml_root = load_xml_file(ai_path)
+    company_index = build_company_index(xml_root)
+
+    assert check_company_index(xml_root, company_index) == []
+    assert len(company_index) == COMPANY_COUNT
+
+
+def test_index_after_build_new_company(xml_root, company_index):
+    new_company, new_id = build_new_company(xml_root, company_index)
+    xml_root.append(new_company)
+
+    assert new_id == COMPANY_COUNT + 1
+    assert check_company_index(xml_root, company_index) == []
+    assert find_company(xml_root, new_id, company_index) is new_company
+
+
+def test_index_after_delete_company(xml_root, company_index):
+    deleted = find_company(xml_root, 10, company_index)
+    mapping = delete_company_and_reindex(xml_root, 10, company_index)
+
+    assert check_company_index(xml_root, company_index) == []
+    assert deleted not in company_index.values()
+    assert company_ids(xml_root) == [str(i) for i in range(1, COMPANY_COUNT)]
+    assert 10 not in mapping and mapping[11] == 10
+    assert_owner_ids_valid(xml_root)
+
+
+def test_index_after_delete_companies(xml_root, company_index):
+    mapping = delete_companies_and_reindex(xml_root, [3, "7", 7, COMPANY_COUNT], company_index)
+
+    assert check_company_index(xml_root, company_index) == []
+    assert company_ids(xml_root) == [str(i) for i in range(1, COMPANY_COUNT - 2)]
+    assert len(mapping) == COMPANY_COUNT - 3
+    assert_owner_ids_valid(xml_root)
+
+
+def test_bulk_delete_with_unknown_id_changes_nothing(xml_root, company_index):
+    before = company_ids(xml_root)
+
+    with pytest.raises(KeyError):
+        delete_companies_and_reindex(xml_root, [2, COMPANY_COUNT + 10], company_index)
+
+    assert company_ids(xml_root) == before
+    assert check_company_index(xml_root, company_index) == []
+
+
+def test_check_reports_stale_index(xml_root, company_index):
+    xml_root.remove(find_company(xml_root, 5, company_index))
+
+    assert check_company_index(xml_root, company_index) != []
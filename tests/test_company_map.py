@@ -0,0 +1,80 @@
+"""
+The reverse company map is patched on renames/additions instead of rebuilt;
+after every patch it must equal a full build_reverse_map.
+"""
+from types import SimpleNamespace
+
+from AIEditor.logic.company_map import reset_company_map, sync_company_map_entry, add_company_to_map
+from AIEditor.logic.company_table_utils import build_reverse_map
+from AIEditor.logic.CRUD import build_new_company
+from benchmarks.generate import generate_ai_root
+
+
+def make_editor(count=20):
+    editor = SimpleNamespace(xml_root=generate_ai_root(count, seed=7, city_count=50))
+    reset_company_map(editor)
+    return editor
+
+
+def company(editor, cid):
+    return editor.xml_root.find(f"Company[@ID='{cid}']")
+
+
+def rename(editor, cid, name):
+    company(editor, cid).set("Name", name)
+    return sync_company_map_entry(editor, company(editor, cid))
+
+
+def assert_reverse_in_sync(editor):
+    assert editor.company_map_rev == build_reverse_map(editor.company_map)
+
+
+def test_rename_patches_reverse_map():
+    editor = make_editor()
+    old_name = editor.company_map[5]
+    version = editor.company_map_version
+
+    assert rename(editor, 5, "Brand New")
+
+    assert editor.company_map_rev["Brand New"] == 5
+    assert old_name not in editor.company_map_rev or editor.company_map_rev[old_name] != 5
+    assert editor.company_map_version == version + 1
+    assert_reverse_in_sync(editor)
+
+
+def test_unchanged_name_is_not_a_change():
+    editor = make_editor()
+    version = editor.company_map_version
+
+    assert not rename(editor, 5, editor.company_map[5])
+    assert editor.company_map_version == version
+
+
+def test_shared_labels_resolve_to_first_id():
+    editor = make_editor()
+
+    rename(editor, 8, "Twin")
+    rename(editor, 3, "Twin")
+    assert editor.company_map_rev["Twin"] == 3
+    assert_reverse_in_sync(editor)
+
+    rename(editor, 3, "Solo")   # 8 takes the shared label back
+    assert editor.company_map_rev["Twin"] == 8
+    assert_reverse_in_sync(editor)
+
+    rename(editor, 8, "Other")
+    assert "Twin" not in editor.company_map_rev
+    assert_reverse_in_sync(editor)
+
+
+def test_added_company_and_missing_name():
+    editor = make_editor()
+    new_company, new_id = build_new_company(editor.xml_root)
+    editor.xml_root.append(new_company)
+    add_company_to_map(editor, new_company)
+    assert_reverse_in_sync(editor)
+
+    del new_company.attrib["Name"]
+    sync_company_map_entry(editor, new_company)
+    assert editor.company_map_rev["None"] == new_id   # same label build_reverse_map uses
+    assert_reverse_in_sync(editor)
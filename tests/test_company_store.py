@@ -0,0 +1,99 @@
+"""
+StoreColumn must give back exactly the text it was fed, whatever it had to do
+to store it (int → float promotion, invalid text, dropped rows), and the
+CompanyStore must mirror element edits.
+"""
+import math
+import xml.etree.ElementTree as ET
+
+from AIEditor.logic.company_store import CompanyStore, StoreColumn, MISSING_INT
+from benchmarks.generate import generate_ai_root
+
+
+def test_int_column_promotes_to_float_on_fraction():
+    column = StoreColumn.from_values("Funds_OnHand", ["100", None, "250"])
+    assert column.values.typecode == "q"
+
+    column.append("12.5")
+
+    assert column.values.typecode == "d"
+    assert math.isnan(column.values[1])
+    assert column.texts() == ["100", None, "250", "12.5"]
+
+
+def test_from_values_promotes_mixed_column():
+    column = StoreColumn.from_values("Funds_OnHand", ["1", "2.5", "3"])
+
+    assert column.is_float
+    assert column.texts() == ["1", "2.5", "3"]   # whole values in an int field still print as ints
+
+
+def test_non_canonical_text_is_kept():
+    column = StoreColumn.from_values("Behavior_Rating_Performance", ["0.50", "-1", "0.25", ""])
+
+    assert list(column.values[:3]) == [0.5, -1.0, 0.25]
+    assert column.texts() == ["0.50", "-1", "0.25", ""]
+
+
+def test_invalid_text_falls_back_to_raw():
+    column = StoreColumn.from_values("Founded", ["1900", "soon", "1950"])
+
+    assert column.invalid == {1}
+    assert column.values[1] == MISSING_INT
+    assert column.texts() == ["1900", "soon", "1950"]
+
+    column.set(1, "1920")
+    assert column.invalid == set()
+    assert column.get(1) == "1920"
+
+
+def test_keep_rows_renumbers_raw_and_invalid():
+    column = StoreColumn.from_values("Founded", ["1900", "007", "soon", "1950", "x"])
+
+    column.keep_rows([1, 2, 3])
+
+    assert column.texts() == ["007", "soon", "1950"]
+    assert column.invalid == {1}
+
+
+def test_keep_rows_on_text_column():
+    column = StoreColumn.from_values("Name", ["A", "B", None, "D"])
+
+    column.keep_rows([0, 3])
+
+    assert column.texts() == ["A", "D"]
+
+
+def test_refresh_company_mirrors_element_edits():
+    xml_root = generate_ai_root(10, seed=4, city_count=50)
+    store = CompanyStore.from_xml(xml_root)
+    company = xml_root.find("Company[@ID='3']")
+    row = store.row_for_id(3)
+    stamp = store.stamp(row)
+
+    company.set("Name", "Renamed")
+    company.find("Funds").set("OnHand", "12.75")
+    ET.SubElement(company, "Extra", {"Flag": "yes"})
+    store.refresh_company(company)
+
+    assert store.get("Name", row) == "Renamed"
+    assert store.get("Funds_OnHand", row) == "12.75"
+    assert store.columns["Funds_OnHand"].is_float
+    assert store.get("Extra_Flag", row) == "yes"
+    assert store.get("Extra_Flag", 0, None) is None
+    assert store.stamp(row) > stamp
+    # every other row still reads back its own element
+    other = xml_root.find("Company[@ID='4']")
+    assert store.get("Funds_OnHand", store.row_for_id(4)) == other.find("Funds").get("OnHand")
+
+
+def test_store_reads_back_every_attribute():
+    xml_root = generate_ai_root(50, seed=4, city_count=50)
+    store = CompanyStore.from_xml(xml_root)
+
+    for row, company in enumerate(xml_root.findall("Company")):
+        for key, value in company.attrib.items():
+            assert store.get(key, row, None) == value
+        for child in company:
+            for key, value in child.attrib.items():
+                assert store.get(f"{child.tag}_{key}", row, None) == value
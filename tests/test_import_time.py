@@ -0,0 +1,27 @@
+"""
+Startup guard: importing the app must not pull in the heavy data modules
+(they are imported lazily by analysis/export or warmed up after the window shows).
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.check_import_time import FORBIDDEN
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def modules_loaded_by(module):
+    """Top-level package names in sys.modules after `import module` in a fresh interpreter."""
+    code = f"import sys, {module}; print('\\n'.join(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=REPO_ROOT)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["app", "AIEditor.AIEditor"])
+def test_heavy_modules_stay_lazy(module):
+    eager = modules_loaded_by(module) & set(FORBIDDEN)
+    assert not eager, f"import {module} pulls in {sorted(eager)} at startup"
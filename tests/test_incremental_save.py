@@ -0,0 +1,87 @@
+"""
+Patch-save must produce a file that re-parses and matches a full save
+everywhere except the edited company.
+"""
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from AIEditor.logic.incremental_save import scan_company_spans, save_xml_patched
+from AIEditor.logic.xml_utils import save_xml_to_file
+from benchmarks.generate import generate_ai_root
+
+COMPANY_COUNT = 20
+EDITED_ID = "7"
+
+
+def write_fixture(path, encoding):
+    """Full save, then rewrite the declaration to the wanted encoding (ASCII content either way)."""
+    save_xml_to_file(generate_ai_root(COMPANY_COUNT, seed=2, city_count=50), str(path))
+    data = path.read_bytes()
+    data.decode("ascii")   # the generator only writes ASCII, so re-declaring is valid
+    declaration = b"encoding='utf-8'"
+    assert declaration in data
+    path.write_bytes(data.replace(declaration, f"encoding='{encoding}'".encode("ascii"), 1))
+
+
+def rename_and_patch(path, name):
+    root = ET.parse(path).getroot()
+    span_info = scan_company_spans(str(path), root)
+    assert span_info is not None
+
+    company = root.find(f"Company[@ID='{EDITED_ID}']")
+    company.set("Name", name)
+    new_info = save_xml_patched(span_info, str(path), [company])
+    return root, span_info, new_info
+
+
+def without_company(data, span):
+    start, end = span
+    return data[:start] + data[end:]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "us-ascii"])
+def test_patched_file_reparses(tmp_path, encoding):
+    path = tmp_path / "ai.xml"
+    write_fixture(path, encoding)
+    original = path.read_bytes()
+
+    root, span_info, new_info = rename_and_patch(path, "Renée & <Co>")
+    patched = path.read_bytes()
+
+    reparsed = ET.parse(path).getroot()
+    assert reparsed.find(f"Company[@ID='{EDITED_ID}']").get("Name") == "Renée & <Co>"
+    assert [c.get("Name") for c in reparsed.findall("Company")] == [c.get("Name") for c in root.findall("Company")]
+
+    # untouched bytes are copied verbatim
+    company = root.find(f"Company[@ID='{EDITED_ID}']")
+    assert without_company(patched, new_info["spans"][company]) == without_company(original, span_info["spans"][company])
+
+
+def test_ascii_patch_uses_character_references(tmp_path):
+    path = tmp_path / "ai.xml"
+    write_fixture(path, "us-ascii")
+
+    _, _, new_info = rename_and_patch(path, "Renée")
+
+    assert new_info["encoding"] == "ascii"
+    path.read_bytes().decode("ascii")
+    assert b"Ren&#233;e" in path.read_bytes()
+
+
+def test_utf8_patch_matches_full_save(tmp_path):
+    path = tmp_path / "ai.xml"
+    full_path = tmp_path / "full.xml"
+    write_fixture(path, "utf-8")
+
+    root, _, _ = rename_and_patch(path, "Renée")
+    save_xml_to_file(root, str(full_path))
+
+    assert path.read_bytes() == full_path.read_bytes()
+
+
+def test_non_utf8_declaration_is_not_patchable(tmp_path):
+    path = tmp_path / "ai.xml"
+    write_fixture(path, "iso-8859-1")
+
+    assert scan_company_spans(str(path), ET.parse(path).getroot()) is None
@@ -0,0 +1,63 @@
+"""
+The remembered virtual-table selection must follow a bulk delete + reindex
+and must not survive into a newly loaded XML.
+"""
+from types import SimpleNamespace
+
+from AIEditor.logic.company_index import build_company_index
+from AIEditor.logic.CRUD import delete_companies_and_reindex
+from AIEditor.logic.virtual_table import (
+    set_table_rows,
+    get_selected_table_company_ids,
+    reset_table_selection,
+    remap_table_selection,
+)
+from benchmarks.generate import generate_ai_root
+
+COMPANY_COUNT = 30
+
+
+def virtual_editor(xml_root, selected, anchor=None):
+    editor = SimpleNamespace(virtual_table_active=True)
+    set_table_rows(editor, [SimpleNamespace(id=c.get("ID")) for c in xml_root.findall("Company")])
+    editor.selected_company_ids = set(selected)
+    editor.selected_company_id = anchor
+    editor.table_select_anchor = anchor
+    return editor
+
+
+def test_remap_after_bulk_delete():
+    xml_root = generate_ai_root(COMPANY_COUNT, seed=3, city_count=50)
+    company_index = build_company_index(xml_root)
+    editor = virtual_editor(xml_root, {"4", "10", "20"}, anchor="20")
+
+    mapping = delete_companies_and_reindex(xml_root, ["4", "10"], company_index)
+    remap_table_selection(editor, mapping)
+    set_table_rows(editor, [SimpleNamespace(id=c.get("ID")) for c in xml_root.findall("Company")])
+
+    # 20 moved down past the two deleted rows; the deleted IDs are gone, not reused
+    assert editor.selected_company_ids == {"18"}
+    assert editor.selected_company_id == "18"
+    assert editor.table_select_anchor == "18"
+    assert get_selected_table_company_ids(editor) == ["18"]
+
+
+def test_remap_when_every_company_is_deleted():
+    xml_root = generate_ai_root(3, seed=3, city_count=50)
+    editor = virtual_editor(xml_root, {"1", "2", "3"}, anchor="2")
+
+    mapping = delete_companies_and_reindex(xml_root, ["1", "2", "3"], build_company_index(xml_root))
+    remap_table_selection(editor, mapping)
+
+    assert mapping == {}
+    assert editor.selected_company_ids == set()
+    assert editor.selected_company_id is None and editor.table_select_anchor is None
+
+
+def test_reset_for_new_xml():
+    editor = virtual_editor(generate_ai_root(COMPANY_COUNT, seed=3, city_count=50), {"2", "5"}, anchor="5")
+    reset_table_selection(editor)
+    set_table_rows(editor, [SimpleNamespace(id=str(i)) for i in range(1, 11)])
+
+    assert get_selected_table_company_ids(editor) == []
+    assert editor.selected_company_id is None and editor.table_select_anchor is None
@@ -0,0 +1,64 @@
+"""
+TaskRunner polls results on the Tk side via widget.after; after shutdown()
+it must stop scheduling polls and drop late results.
+"""
+import threading
+
+from AIEditor.logic.task_runner import TaskRunner
+
+
+class FakeWidget:
+    """Records after() calls instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, []
+        for callback in pending:
+            callback()
+
+
+def test_results_arrive_through_poll():
+    widget = FakeWidget()
+    runner = TaskRunner(widget, max_workers=1)
+    done = []
+
+    runner.submit("job", lambda context: 42, on_done=lambda task, result: done.append(result))
+    runner.executor.shutdown(wait=True)
+    widget.run_pending()
+
+    assert done == [42]
+    assert not runner.is_busy()
+    runner.shutdown()
+
+
+def test_shutdown_stops_polling_and_cancels():
+    widget = FakeWidget()
+    runner = TaskRunner(widget, max_workers=1)
+    started = threading.Event()
+    callbacks = []
+
+    def job(context):
+        started.set()
+        while not context.cancelled():
+            context.cancel_event.wait(0.01)
+        context.check_cancelled()
+
+    runner.submit("load", job, cancellable=True, on_cancel=callbacks.append, on_done=lambda *a: callbacks.append(a))
+    queued = runner.submit("load", job, cancellable=True)
+    started.wait(1)
+
+    runner.shutdown()
+    runner.executor.shutdown(wait=True)   # the running job noticed the cancel; the queued one never ran
+    assert queued.cancel_event.is_set()
+
+    widget.run_pending()   # the poll scheduled before shutdown fires once and does nothing
+    assert callbacks == []
+    assert widget.scheduled == []
+
+    runner._schedule_poll()
+    assert widget.scheduled == []
@@ -0,0 +1,55 @@
+"""
+save_xml_to_file must write exactly what the legacy indent_xml + ElementTree.write
+path wrote, without modifying the tree.
+"""
+import copy
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from AIEditor.logic.xml_utils import save_xml_to_file, indent_xml
+from benchmarks.generate import generate_ai_root
+
+
+def legacy_save(xml_root, path):
+    tree_copy = copy.deepcopy(xml_root)
+    indent_xml(tree_copy)
+    ET.ElementTree(tree_copy).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def add_awkward_content(xml_root):
+    """Text, tails, escaping and non-ASCII the generator never produces."""
+    companies = xml_root.findall("Company")
+    companies[0].set("Name", 'Smith & Sons <"Motors"> \'Ltd\'')
+    companies[1].set("Name", "Renée\tAuto\nWorks\r")
+    companies[2].text = "free text & <stuff>"
+    companies[2].find("Funds").tail = "\n\t\tkept tail > "
+    companies[3].find("Funds").text = "  "
+    ET.SubElement(companies[4], "Empty")
+    ET.SubElement(companies[4], "Nested").append(ET.Element("Leaf", {"Value": "☃ ]]>"}))
+    companies[5].tail = "  trailing text after a company "
+    xml_root.append(ET.Comment(" a comment "))
+    return xml_root
+
+
+@pytest.mark.parametrize("awkward", [False, True])
+def test_streaming_writer_matches_legacy(tmp_path, awkward):
+    xml_root = generate_ai_root(30, seed=6, city_count=50)
+    if awkward:
+        add_awkward_content(xml_root)
+    before = ET.tostring(xml_root)
+
+    save_xml_to_file(xml_root, str(tmp_path / "new.xml"))
+    legacy_save(xml_root, str(tmp_path / "legacy.xml"))
+
+    assert (tmp_path / "new.xml").read_bytes() == (tmp_path / "legacy.xml").read_bytes()
+    assert ET.tostring(xml_root) == before   # the tree itself is not re-indented
+
+
+def test_root_without_companies(tmp_path):
+    xml_root = ET.Element("AINode")
+
+    save_xml_to_file(xml_root, str(tmp_path / "new.xml"))
+    legacy_save(xml_root, str(tmp_path / "legacy.xml"))
+
+    assert (tmp_path / "new.xml").read_bytes() == (tmp_path / "legacy.xml").read_bytes()